@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# =============================================================================
+# TTL CACHE
+#
+# Small thread-safe LRU map whose entries expire after ttl seconds. Shared by
+# the researcher (tool results) and the response agent (final answers) so a
+# repeat of a question asked moments earlier skips the network and the LLM.
+# =============================================================================
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry.
+
+    Args:
+        ttl:         Seconds an entry stays fresh after it is stored.
+        max_entries: Least-recently-used entries are evicted past this size.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the fresh value stored under key, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
@@ -1,9 +1,9 @@
 import asyncio
-import json
 import queue
 import threading
 import time
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -56,14 +56,19 @@ async def chat(req: ChatRequest):
                 SystemMessage(content=SYSTEM_PROMPT),
                 HumanMessage(content=prompt),
             ],
+            "user_msg":             "",
+            "data_needed":          "",
+            "final_response":       "",
+            "tool_context":         "",
             "stream_chunks":        [],
             "display_results":      [],
             "data_fetched":         False,
+            "display_failed":       False,
             "evaluation":           "",
             "evaluation_critique":  "",
             "retry_count":          0,
             "token_queue":          thinking_queue,   # nodes write status here
-            "start_time":           time.time(),
+            "start_time":           time.monotonic(),   # SLA clock — immune to wall-clock jumps
         }
 
         def run_graph():
@@ -78,7 +83,7 @@ async def chat(req: ChatRequest):
                         # Separate thinking vs final content
                         for chunk in chunks:
                             try:
-                                chunk_type = json.loads(chunk).get("type", "")
+                                chunk_type = orjson.loads(chunk).get("type", "")
                             except Exception:
                                 chunk_type = ""
 
@@ -89,24 +94,22 @@ async def chat(req: ChatRequest):
                                 # Final content — collect for ordered flush
                                 node_chunks.setdefault(node_name, []).append(chunk)
 
-                        # Build display chunk if display agent ran
+                        # Build display chunk if display agent ran — its chart objects are
+                        # already a flat list, so they are emitted as-is
                         if node_name == "display_agent":
-                            display_results = node_state.get("display_results", [])
+                            display_results = node_state.get("display_results")
                             if display_results:
-                                flat = []
-                                for r in display_results:
-                                    flat.extend(r) if isinstance(r, list) else flat.append(r)
-                                display_chunk = emit("display_modules", flat)
+                                display_chunk = emit("display_modules", display_results)
                                 node_chunks.setdefault("display_agent_emit", []).append(display_chunk)
-                                log.info(f"[STREAM] display_modules emitted with {len(flat)} item(s)")
+                                log.info(
+                                    f"[STREAM] display_modules emitted with "
+                                    f"{len(display_results)} item(s)"
+                                )
 
             except Exception as e:
                 log.error(f"[GRAPH] Error during graph execution: {e}", exc_info=True)
                 node_chunks["__error__"] = [
-                    json.dumps({
-                        "type": "response_content",
-                        "data": "Something went wrong. Please try again.",
-                    }) + "\n"
+                    emit("response_content", "Something went wrong. Please try again.")
                 ]
             finally:
                 # Collect and order final chunks, then signal done
@@ -114,7 +117,7 @@ async def chat(req: ChatRequest):
                 all_final = [c for chunks in node_chunks.values() for c in chunks]
                 all_final.sort(
                     key=lambda c: TYPE_ORDER.get(
-                        json.loads(c).get("type", "") if c.strip() else "", 99
+                        orjson.loads(c).get("type", "") if c.strip() else "", 99
                     )
                 )
                 for chunk in all_final:
@@ -131,6 +134,7 @@ async def chat(req: ChatRequest):
         # ── Stream thinking in real-time until graph finishes ─────────────────
         # We poll thinking_queue continuously. Once we see __graph_done__ there
         # we know the graph is finished and result_queue is fully populated.
+        # The response agent also streams its answer tokens through this queue.
         while True:
             item = await loop.run_in_executor(None, thinking_queue.get)
 
@@ -143,7 +147,7 @@ async def chat(req: ChatRequest):
                 # safe to ignore here since we're draining continuously anyway
                 continue
 
-            log.info(f"[CONTROLLER] Thinking: {item[:LOG_CHUNK_PREVIEW].strip()}")
+            log.debug("[CONTROLLER] Live: %s", item[:LOG_CHUNK_PREVIEW].strip())
             yield item
 
         # ── Join thread then flush final results ──────────────────────────────
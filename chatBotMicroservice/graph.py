@@ -38,12 +38,12 @@ def build_graph():
     # builder.add_node("validator",       validator_node)
     # Entry
     builder.set_entry_point("project_manager")
-    # PM fans out to both parallel nodes
+    # PM hands off to the researcher
     builder.add_edge("project_manager", "researcher")
-    # Both parallel nodes fan in to response_agent
+    # Researcher fans out — display_agent only needs the plan + research
+    # context, so its chart-data LLM call overlaps with response generation
     builder.add_edge("researcher",  "response_agent")
-    # display_agent runs after response_agent — full context available
-    builder.add_edge("response_agent", "display_agent")
+    builder.add_edge("researcher",  "display_agent")
     # builder.add_edge("display_agent",  "validator")
     # Validator: pass → END, fail → back to PM
     # builder.add_conditional_edges(
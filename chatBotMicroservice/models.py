@@ -1,4 +1,5 @@
-from langchain_ollama import ChatOllama
+import threading
+from langchain_ollama import ChatOllama, OllamaEmbeddings
 from httpx import Timeout as HttpxTimeout
 
 # =============================================================================
@@ -9,19 +10,6 @@ from httpx import Timeout as HttpxTimeout
 # no thinking mode overhead.
 # =============================================================================
 
-# Fast/tiny — thinker node (short narrative) + validator (JSON verdict)
-llm_fast = ChatOllama(
-    model="llama3.2:1b",
-    num_ctx=1024,
-    num_predict=256,
-    num_thread=4,
-    repeat_penalty=1.1,
-    keep_alive="10m",
-    client_kwargs={
-        "timeout": HttpxTimeout(connect=5.0, read=30.0, write=5.0, pool=5.0)
-    },
-)
-
 # Medium — PM planning + researcher planner (needs meta-awareness)
 llm_medium = ChatOllama(
     model="llama3.2:3b",
@@ -58,4 +46,57 @@ llm_large = ChatOllama(
     repeat_penalty=1.15,
     temperature=0.7,
     keep_alive="10m",
-)
\ No newline at end of file
+)
+
+
+# =============================================================================
+# LAZY CLIENTS
+#
+# Every client builds its own httpx client (and SSL context) when constructed,
+# ~40 ms apiece. The validator is not wired into the graph and the embedder is
+# only needed on the first planner-cache lookup, so these two are built on
+# first attribute access (PEP 562) instead of at import.
+# =============================================================================
+
+def _build_llm_fast() -> ChatOllama:
+    # Fast/tiny — validator (JSON verdict)
+    return ChatOllama(
+        model="llama3.2:1b",
+        num_ctx=1024,
+        num_predict=256,
+        num_thread=4,
+        repeat_penalty=1.1,
+        keep_alive="10m",
+        client_kwargs={
+            "timeout": HttpxTimeout(connect=5.0, read=30.0, write=5.0, pool=5.0)
+        },
+    )
+
+
+def _build_embedder() -> OllamaEmbeddings:
+    # Embeddings — semantic lookup for the researcher planner cache. Only used
+    # with PLANNER_SEMANTIC_CACHE=1; needs `ollama pull nomic-embed-text`
+    return OllamaEmbeddings(
+        model="nomic-embed-text",
+        keep_alive=600,     # seconds — OllamaEmbeddings takes an int, not "10m"
+        client_kwargs={
+            "timeout": HttpxTimeout(connect=5.0, read=10.0, write=5.0, pool=5.0)
+        },
+    )
+
+
+_LAZY_CLIENTS = {
+    "llm_fast": _build_llm_fast,
+    "embedder": _build_embedder,
+}
+_lazy_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    builder = _LAZY_CLIENTS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lazy_lock:
+        if name not in globals():
+            globals()[name] = builder()   # later lookups skip __getattr__
+    return globals()[name]
@@ -1,17 +1,20 @@
-import json
+import logging
 import time
 import re
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
-from state import AgentState
+from state import AgentState, NodeOutput
 from models import llm_large
 from tools import TOOL_MAP
 from nodes.helpers import (
-    log, _sla_exceeded, _truncate, llm_call,
+    log, _get_user_msg, _new_tool_id, _sla_exceeded, _truncate, llm_call,
     CHART_TYPE_EXTRACT,
+    DISPLAY_QUESTION_WINDOW,
     RESPOND_TOOL_CONTEXT_WINDOW,
-    _extract_tool_context,
+    _get_tool_context,
     extract_json_object,
 )
+from nodes.prompts import DATA_PROCESSOR_PROMPT
 
 # --------------------------
 # GRAPH TYPE MAP
@@ -26,33 +29,15 @@ _GRAPH_TYPE_MAP = {
     "histogram":   "BarGraph",
 }
 
-# --------------------------
-# CALL 1 PROMPT: Data extraction only
-# --------------------------
-DATA_PROCESSOR_PROMPT = (
-    "You are a data extraction and organization assistant.\n"
-    "Given a user request and raw research context, extract and organize the relevant data.\n"
-    "Output ONLY valid JSON with this exact structure:\n"
-    "{\n"
-    '  "title": "string — descriptive chart title",\n'
-    '  "xaxis_label": "string — x axis label",\n'
-    '  "yaxis_label": "string — y axis label",\n'
-    '  "series": [\n'
-    "    {\n"
-    '      "name": "string — series name",\n'
-    '      "x": [1, 2, 3],\n'
-    '      "y": [1.2, 3.4, 5.6]\n'
-    "    }\n"
-    "  ]\n"
-    "}\n"
-    "Rules:\n"
-    "- x must be a flat 1D array of integers (e.g. years, indices)\n"
-    "- y must be a flat 1D array of numbers, matching x in length\n"
-    "- Each series gets its own object in the array\n"
-    "- 7–28 points per series\n"
-    "- If real data is available in context, use it. Otherwise use illustrative numeric values.\n"
-    "- No placeholder strings, no nulls, no nested arrays.\n"
-    "- Output ONLY the JSON object. No markdown, no explanation.\n"
+# Constant part of the get_graph_data tool call recorded in message history
+_GRAPH_TOOL_CALL = {"name": "get_graph_data", "type": "tool_call"}
+
+# User turn for CALL 1 — filled with (user request, research context, graph type)
+_DATA_USER_TEMPLATE = (
+    "User request: %s\n"
+    "%s\n"
+    "Graph type: %s\n"
+    "Extract and organize the data needed for this chart."
 )
 
 # --------------------------
@@ -76,15 +61,13 @@ def _clean_llm_json(raw_text: str) -> str:
         return "{}"
     return raw_text
 
-def _validate_json(raw_text: str) -> str:
+def _parse_llm_json(raw_text: str) -> dict:
+    """Clean and parse LLM output once; {} when it is not a JSON object."""
     try:
-        cleaned = _clean_llm_json(raw_text)
-        parsed = json.loads(cleaned)
-        if not isinstance(parsed, dict):
-            return "{}"
-        return cleaned
+        parsed = orjson.loads(_clean_llm_json(raw_text))
     except Exception:
-        return "{}"
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
 
 # --------------------------
 # HELPER: Deterministic chart builder
@@ -94,6 +77,59 @@ COLORS = [
     "#FFA15A", "#19D3F3", "#FF6692", "#B6E880",
 ]
 
+# Per-trace source for the specialized builders below. Each entry mirrors the
+# matching branch of _build_chart_object with the series index, default name
+# and colour baked in as literals.
+_TRACE_SOURCE = {
+    "LineGraph": (
+        '{{"x": s{i}["x"], "y": s{i}["y"], "name": s{i}.get("name", "Series {n}"), '
+        '"type": "scatter", "mode": "lines+markers", "line": {{"color": "{color}"}}}}'
+    ),
+    "BarGraph": (
+        '{{"x": [str(v) for v in s{i}["x"]], "y": s{i}["y"], '
+        '"name": s{i}.get("name", "Series {n}"), '
+        '"type": "bar", "marker": {{"color": "{color}"}}}}'
+    ),
+    "ScatterPlot": (
+        '{{"x": s{i}["x"], "y": s{i}["y"], "name": s{i}.get("name", "Series {n}"), '
+        '"mode": "markers", "marker": {{"color": "{color}"}}}}'
+    ),
+}
+
+_BUILDER_CACHE: dict = {}
+
+
+def _specialized_builder(graph_type: str, n_series: int):
+    """Return a generated trace builder for this (graph_type, series count) shape.
+
+    The builder is compiled on first use and cached, so repeat shapes skip the
+    per-series loop and type dispatch. Returns None for unknown graph types or
+    more series than COLORS — callers fall back to the generic loop.
+    """
+    key = (graph_type, n_series)
+    builder = _BUILDER_CACHE.get(key)
+    if builder is not None:
+        return builder
+
+    trace = _TRACE_SOURCE.get(graph_type)
+    if trace is None or not 0 < n_series <= len(COLORS):
+        return None
+
+    names = ", ".join(f"s{i}" for i in range(n_series))
+    traces = ", ".join(
+        trace.format(i=i, n=i + 1, color=COLORS[i]) for i in range(n_series)
+    )
+    source = (
+        f"def _build(series):\n"
+        f"    {names}, = series\n"
+        f"    return [{traces}]\n"
+    )
+    namespace: dict = {}
+    exec(compile(source, f"<chart builder {graph_type}/{n_series}>", "exec"), namespace)
+    builder = _BUILDER_CACHE[key] = namespace["_build"]
+    return builder
+
+
 def _build_chart_object(graph_type: str, organized_data: dict) -> dict:
     title        = organized_data.get("title", "Chart")
     xaxis_label  = organized_data.get("xaxis_label", "X")
@@ -109,7 +145,10 @@ def _build_chart_object(graph_type: str, organized_data: dict) -> dict:
         "yaxis": {"title": yaxis_label},
     }
 
-    if graph_type == "LineGraph":
+    builder = _specialized_builder(graph_type, len(series))
+    if builder is not None:
+        data = builder(series)
+    elif graph_type == "LineGraph":
         data = [
             {
                 "x": s["x"], "y": s["y"],
@@ -148,9 +187,9 @@ def _build_chart_object(graph_type: str, organized_data: dict) -> dict:
 # --------------------------
 # MAIN DISPLAY AGENT
 # --------------------------
-def display_agent_node(state: AgentState) -> AgentState:
+def display_agent_node(state: AgentState) -> NodeOutput:
     log.info("━━━ [DISPLAY AGENT] Determining visuals")
-    t0 = time.time()
+    t0 = time.perf_counter()
 
     if _sla_exceeded(state):
         return {"messages": [], "display_results": [], "stream_chunks": []}
@@ -164,27 +203,20 @@ def display_agent_node(state: AgentState) -> AgentState:
     if not graph_type:
         return {"messages": [], "display_results": [], "stream_chunks": []}
 
-    user_msg     = next(
-        (m.content for m in state["messages"] if isinstance(m, HumanMessage)), ""
-    )
-    tool_context = _extract_tool_context(state["messages"])
+    user_msg     = _get_user_msg(state)
+    tool_context = _get_tool_context(state)
     context_section = (
         f"Research context (use these numbers only):\n{tool_context[:RESPOND_TOOL_CONTEXT_WINDOW]}"
         if tool_context else "Research context: None. Use illustrative numeric values."
     )
 
-    tool_id = f"tc_graph_{int(t0 * 1000)}"
+    tool_id = _new_tool_id("graph")
     ai_msg  = AIMessage(
         content="",
-        tool_calls=[{
-            "name": "get_graph_data",
-            "args": {"graph_type": graph_type},
-            "id": tool_id,
-            "type": "tool_call",
-        }]
+        tool_calls=[{**_GRAPH_TOOL_CALL, "args": {"graph_type": graph_type}, "id": tool_id}],
     )
 
-    def _fail(reason: str) -> AgentState:
+    def _fail(reason: str) -> NodeOutput:
         log.error(f"[DISPLAY] {reason}")
         return {
             "messages": [ai_msg, ToolMessage(content=reason, tool_call_id=tool_id)],
@@ -194,11 +226,8 @@ def display_agent_node(state: AgentState) -> AgentState:
         }
 
     # ── CALL 1: Extract & organize data via intermediary ──────────────────────
-    data_user_msg = (
-        f"User request: {user_msg[:300]}\n"
-        f"{context_section}\n"
-        f"Graph type: {graph_type}\n"
-        "Extract and organize the data needed for this chart."
+    data_user_msg = _DATA_USER_TEMPLATE % (
+        user_msg[:DISPLAY_QUESTION_WINDOW], context_section, graph_type
     )
 
     raw_data_text = llm_call(
@@ -216,11 +245,11 @@ def display_agent_node(state: AgentState) -> AgentState:
     if not raw_data_text:
         return _fail("Data processing call returned empty response")
 
-    log.debug(f"[DISPLAY] Raw data output: {_truncate(raw_data_text, 200)}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[DISPLAY] Raw data output: %s", _truncate(raw_data_text, 200))
 
     try:
-        clean_json     = _validate_json(raw_data_text)
-        organized_data = json.loads(clean_json)
+        organized_data = _parse_llm_json(raw_data_text)
         if "series" not in organized_data or not organized_data["series"]:
             raise ValueError("No series data in response")
     except Exception as e:
@@ -232,7 +261,7 @@ def display_agent_node(state: AgentState) -> AgentState:
     except Exception as e:
         return _fail(f"Chart building failed: {e}")
 
-    log.info(f"[DISPLAY] ✓ Done in {time.time() - t0:.2f}s")
+    log.info(f"[DISPLAY] ✓ Done in {time.perf_counter() - t0:.2f}s")
 
     tool_msg = ToolMessage(content="Chart generated successfully.", tool_call_id=tool_id)
     return {
@@ -1,8 +1,11 @@
-import json
+import itertools
 import logging
+import os
 import time
 import re
-from langchain_core.messages import ToolMessage
+from contextlib import closing
+import orjson
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
 # =============================================================================
 # LOGGING
@@ -23,6 +26,30 @@ GRAPH_SLA_SECS          = 1000   # hard timeout for the whole graph
 MAX_PROMPT_CHARS        = 15000  # max chars of a tool result stored in state
 MAX_MESSAGES            = 6     # max conversation turns kept
 RESEARCHER_MAX_ITERATIONS = 10   # max tool-call iterations per request
+RESEARCHER_MAX_PARALLEL_CALLS = 3  # max CALL lines run concurrently per planner step
+# Stop after the first planner step that runs tools (one planner call per turn).
+# Set RESEARCHER_SINGLE_SHOT=0 to let the planner iterate on what it fetched.
+RESEARCHER_SINGLE_SHOT = (
+    os.getenv("RESEARCHER_SINGLE_SHOT", "1").lower() not in ("0", "false", "no")
+)
+# Semantic planner-cache lookup embeds each planner turn through Ollama, so it
+# needs the nomic-embed-text model pulled. Off unless PLANNER_SEMANTIC_CACHE=1.
+PLANNER_SEMANTIC_CACHE = (
+    os.getenv("PLANNER_SEMANTIC_CACHE", "0").lower() in ("1", "true", "yes")
+)
+
+# =============================================================================
+# CONSTANTS — Response streaming
+# =============================================================================
+
+STREAM_FLUSH_TOKENS = 32     # coalesce up to this many deltas per streamed chunk
+STREAM_FLUSH_SECS   = 0.05   # ...or flush once this long has passed since the last one
+
+# =============================================================================
+# CONSTANTS — Result caches
+# =============================================================================
+
+RESPONSE_CACHE_TTL_SECS = 60    # identical answer prompts reuse the answer this long
 
 # =============================================================================
 # CONSTANTS — LLM window sizes (chars sent to each node)
@@ -33,6 +60,7 @@ RESEARCHER_NEED_WINDOW      = 200   # data_needed excerpt shown to planner
 RESEARCHER_CONTEXT_WINDOW   = 600   # accumulated results shown to planner
 RESPOND_TOOL_CONTEXT_WINDOW = 1500  # tool context passed to response agent
 RESPOND_PM_PLAN_WINDOW      = 400   # pm_plan excerpt appended to user turn
+DISPLAY_QUESTION_WINDOW     = 300   # user question shown to display data call
 VALIDATOR_QUESTION_WINDOW   = 200   # user question shown to validator
 VALIDATOR_RESPONSE_WINDOW   = 600   # response excerpt shown to validator
 LOG_CHUNK_PREVIEW           = 80    # chars of a chunk logged in controller
@@ -46,12 +74,20 @@ LOG_CHUNK_PREVIEW           = 80    # chars of a chunk logged in controller
 DATA_NEEDED_EXTRACT = re.compile(r"DATA_NEEDED\s*\*{0,2}\s*:\s*\*{0,2}\s*(.+?)(?:\n|$)", re.I)
 CHART_TYPE_EXTRACT  = re.compile(r"CHART_TYPE\s*\*{0,2}\s*:\s*\*{0,2}\s*(\w+)", re.I)
 
+# DATA_NEEDED values meaning "no research". Compared after _no_data_needed()
+# strips bullets, bold markers, quotes and trailing punctuation, so "- None.",
+# "**NONE**" and "n/a" all hit the early exit.
+_NO_DATA_VALUES = frozenset({
+    "", "none", "n/a", "na", "nothing", "not required", "not needed", "none needed",
+})
+
 # =============================================================================
 # HELPERS
 # =============================================================================
 
 def emit(type: str, data) -> str:
-    return json.dumps({"type": type, "data": data}) + "\n"
+    # Called once per streamed token — orjson, emitting raw UTF-8 rather than \u escapes
+    return orjson.dumps({"type": type, "data": data}).decode() + "\n"
 
 
 def extract_json_object(text: str) -> str:
@@ -97,13 +133,57 @@ def _sla_exceeded(state) -> bool:
     start = state.get("start_time")
     if not start:
         return False
-    elapsed = time.time() - start
+    elapsed = time.monotonic() - start
     if elapsed > GRAPH_SLA_SECS:
         log.warning(f"[SLA] {elapsed:.1f}s > {GRAPH_SLA_SECS}s — triggering early exit")
         return True
     return False
 
 
+# Process-wide sequence — tool_call ids only need to be unique, not timestamps
+_tool_call_seq = itertools.count()
+
+
+def _new_tool_id(tool_name: str) -> str:
+    return f"tc_{tool_name}_{next(_tool_call_seq)}"
+
+
+def _parse_data_needed(pm_plan: str) -> str:
+    match = DATA_NEEDED_EXTRACT.search(pm_plan)
+    return match.group(1).strip() if match else ""
+
+
+def _get_data_needed(state) -> str:
+    """Return the DATA_NEEDED line the project manager cached on state.
+
+    Falls back to parsing pm_plan when the cache is missing.
+    """
+    cached = state.get("data_needed")
+    if cached:
+        return cached
+    return _parse_data_needed(state.get("pm_plan", ""))
+
+
+def _no_data_needed(data_needed: str) -> bool:
+    return data_needed.strip(" \t-*•\"'`").rstrip(".!").lower() in _NO_DATA_VALUES
+
+
+def _first_human_content(messages: list) -> str:
+    return next((m.content for m in messages if isinstance(m, HumanMessage)), "")
+
+
+def _get_user_msg(state) -> str:
+    """Return the user message cached on state by the entry node.
+
+    Falls back to one scan of the message list when the cache is missing
+    (e.g. a node invoked outside the full graph).
+    """
+    cached = state.get("user_msg")
+    if cached:
+        return cached
+    return _first_human_content(state.get("messages", []))
+
+
 def _extract_tool_context(messages: list) -> str:
     return "\n\n".join(
         msg.content for msg in messages
@@ -111,10 +191,22 @@ def _extract_tool_context(messages: list) -> str:
     )
 
 
+def _get_tool_context(state) -> str:
+    """Return the tool results the researcher cached on state, joined by blank lines.
+
+    Falls back to one scan of the message list when the cache is missing.
+    """
+    cached = state.get("tool_context")
+    if cached:
+        return cached
+    return _extract_tool_context(state.get("messages", []))
+
+
 def _llm_text(resp) -> str:
     if not resp:
         return ""
-    log.debug(f"[_llm_text] type={type(resp).__name__} repr={repr(resp)[:300]}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[_llm_text] type=%s repr=%s", type(resp).__name__, repr(resp)[:300])
     content = getattr(resp, "content", None)
     if content is not None and isinstance(content, str) and content.strip():
         return content
@@ -159,6 +251,95 @@ def stream_status(state, message: str) -> dict:
         token_queue.put("__thinking_done__")
     return {"messages": [], "stream_chunks": [chunk_str]}
 
+def stream_lines(llm, max_lines: int = 1, line_prefix: str | None = None):
+    """Return an llm_call-compatible callable that stops streaming early.
+
+    Streams from llm.stream() and closes the stream once max_lines non-blank
+    lines are complete, or as soon as a complete line does not start with
+    line_prefix (case-insensitive). Tokens the caller would discard are never
+    generated. Returns an AIMessage holding the text received so far.
+    """
+    prefix = line_prefix.upper() if line_prefix else None
+
+    def _enough(buffer: str) -> bool:
+        complete = [line.strip() for line in buffer.split("\n")[:-1] if line.strip()]
+        if len(complete) >= max_lines:
+            return True
+        return bool(prefix and complete and not complete[-1].upper().startswith(prefix))
+
+    def _call(messages: list) -> AIMessage:
+        parts: list[str] = []
+        with closing(llm.stream(messages)) as stream:
+            for chunk in stream:
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                parts.append(text)
+                if "\n" in text and _enough("".join(parts)):
+                    break
+        return AIMessage(content="".join(parts))
+    return _call
+
+class TokenStream:
+    """llm_call-compatible callable that streams deltas to the client.
+
+    Non-empty deltas from llm.stream() are coalesced and pushed to
+    state["token_queue"] as chunk_type chunks — one chunk per flush_tokens
+    deltas or flush_secs, whichever comes first, plus a final flush (leading
+    whitespace of the answer is dropped). A call returns an AIMessage holding
+    the full text.
+
+    `emitted` is the text the last call pushed to the client — still set when
+    the stream fails partway and llm_call returns "".
+    """
+
+    def __init__(self, llm, token_queue, chunk_type: str, flush_tokens: int, flush_secs: float):
+        self.llm = llm
+        self.token_queue = token_queue
+        self.chunk_type = chunk_type
+        self.flush_tokens = flush_tokens
+        self.flush_secs = flush_secs
+        self.emitted = ""
+
+    def __call__(self, messages: list) -> AIMessage:
+        token_queue = self.token_queue
+        parts: list[str] = []
+        flushed = 0                     # parts already pushed to the queue
+        last_flush = time.monotonic()
+        self.emitted = ""
+
+        def _flush():
+            nonlocal flushed
+            delta = "".join(parts[flushed:])
+            token_queue.put(emit(self.chunk_type, delta))
+            self.emitted += delta
+            flushed = len(parts)
+
+        for chunk in self.llm.stream(messages):
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            if not parts:
+                text = text.lstrip()
+            if not text:
+                continue
+            parts.append(text)
+            if not token_queue:
+                continue
+            now = time.monotonic()
+            if len(parts) - flushed >= self.flush_tokens or now - last_flush >= self.flush_secs:
+                _flush()
+                last_flush = now
+        if token_queue and flushed < len(parts):
+            _flush()
+        return AIMessage(content="".join(parts))
+
+def stream_tokens(
+    llm,
+    state,
+    chunk_type: str = "response_content",
+    flush_tokens: int = STREAM_FLUSH_TOKENS,
+    flush_secs: float = STREAM_FLUSH_SECS,
+) -> TokenStream:
+    """Return a TokenStream that pushes llm's deltas to state["token_queue"]."""
+    return TokenStream(llm, state.get("token_queue"), chunk_type, flush_tokens, flush_secs)
+
 def llm_call(
     state,
     llm,
@@ -191,8 +372,8 @@ def llm_call(
     if status_before:
         stream_status(state, status_before)
 
-    log.debug(f"[{label}] Sending {len(messages)} message(s) to LLM")
-    t0 = time.time()
+    log.debug("[%s] Sending %d message(s) to LLM", label, len(messages))
+    t0 = time.perf_counter()
 
     try:
         response = llm(messages)
@@ -201,8 +382,8 @@ def llm_call(
         stream_status(state, f"⚠️ {label}: LLM error — {_truncate(str(exc), 80)}")
         return ""
 
-    elapsed = time.time() - t0
-    log.debug(f"[{label}] LLM responded in {elapsed:.2f}s")
+    elapsed = time.perf_counter() - t0
+    log.debug("[%s] LLM responded in %.2fs", label, elapsed)
 
     text = _llm_text(response)
 
@@ -212,10 +393,11 @@ def llm_call(
         return ""
 
     if truncate_result is not None and len(text) > truncate_result:
-        log.debug(f"[{label}] Truncating result from {len(text)} → {truncate_result} chars")
+        log.debug("[%s] Truncating result from %d → %d chars", label, len(text), truncate_result)
         text = text[:truncate_result]
 
-    log.debug(f"[{label}] Result preview: {_truncate(text, LOG_CHUNK_PREVIEW)}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[%s] Result preview: %s", label, _truncate(text, LOG_CHUNK_PREVIEW))
 
     if status_after:
         stream_status(state, status_after)
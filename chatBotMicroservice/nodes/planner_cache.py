@@ -0,0 +1,131 @@
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from nodes.helpers import log
+
+# =============================================================================
+# PLANNER DECISION CACHE
+#
+# Remembers researcher planner decisions keyed on the planner user turn
+# (Question / Need / Have). A repeat of the same turn is an exact hit; a
+# near-identical turn is a semantic hit when the embedding of its focus text
+# (the Question and Need lines, without prompt boilerplate) clears
+# PLANNER_CACHE_THRESHOLD against a stored entry. Either way the planner LLM
+# round-trip is skipped.
+#
+# Embeddings rate "balance sheet for Apple" close to "income statement for
+# Apple", so a semantic hit also requires the same set of content words in the
+# whole turn, case-insensitive — only wording, order and filler words may
+# differ. Semantic lookup is optional: pass embed=None for exact hits only.
+# =============================================================================
+
+PLANNER_CACHE_THRESHOLD   = 0.95   # min cosine similarity for a semantic hit
+PLANNER_CACHE_MAX_ENTRIES = 256    # LRU bound on stored decisions
+
+_WORD_TOKENS = re.compile(r"[a-z0-9][a-z0-9.\-]*")
+# Filler that may differ between two turns asking for the same data
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "for", "of", "and", "or", "in", "on", "to", "with", "by",
+    "from", "me", "my", "please", "show", "get", "give", "what", "is", "are",
+    "was", "its", "it", "about", "question", "need", "have",
+})
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _content_words(text: str) -> frozenset:
+    return frozenset(_WORD_TOKENS.findall(text.lower())) - _FILLER_WORDS
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class PlannerCache:
+    """Thread-safe exact + semantic cache of planner decision lines.
+
+    Args:
+        embed:       Callable mapping a string to an embedding vector, or None
+                     to disable semantic lookup. An embedding failure disables
+                     semantic lookup for that call; only the first is logged
+                     as a warning.
+        threshold:   Minimum cosine similarity for a semantic hit.
+        max_entries: Least-recently-used entries are evicted past this size.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], list[float]] | None,
+        threshold: float = PLANNER_CACHE_THRESHOLD,
+        max_entries: int = PLANNER_CACHE_MAX_ENTRIES,
+    ):
+        self._embed = embed
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[list[float] | None, frozenset, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._embed_warned = False
+
+    def _vector(self, text: str) -> list[float] | None:
+        if self._embed is None:
+            return None
+        try:
+            return self._embed(text)
+        except Exception as exc:
+            if self._embed_warned:
+                log.debug(f"[PLANNER-CACHE] Embedding failed — exact match only: {exc}")
+            else:
+                self._embed_warned = True
+                log.warning(f"[PLANNER-CACHE] Embedding failed — exact match only: {exc}")
+            return None
+
+    def lookup(
+        self, text: str, focus: str | None = None
+    ) -> tuple[str | None, list[float] | None]:
+        """Return (cached decision or None, embedding of focus for a later store).
+
+        text is the whole planner turn; focus is the part that is embedded for
+        semantic lookup and defaults to text.
+        """
+        key = _normalize(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                log.info("[PLANNER-CACHE] Exact hit")
+                return entry[2], entry[0]
+
+        vector = self._vector(text if focus is None else focus)
+        if vector is None:
+            return None, None
+
+        words = _content_words(text)
+        best_key, best_score = None, self._threshold
+        with self._lock:
+            for other_key, (other_vec, other_words, _) in self._entries.items():
+                if other_vec is None or other_words != words:
+                    continue
+                score = _cosine(vector, other_vec)
+                if score >= best_score:
+                    best_key, best_score = other_key, score
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+                log.info(f"[PLANNER-CACHE] Semantic hit (similarity {best_score:.3f})")
+                return self._entries[best_key][2], vector
+        return None, vector
+
+    def store(self, text: str, decision: str, vector: list[float] | None = None) -> None:
+        """Remember decision for text; vector is the focus embedding lookup returned."""
+        key = _normalize(text)
+        with self._lock:
+            self._entries[key] = (vector, _content_words(text), decision)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
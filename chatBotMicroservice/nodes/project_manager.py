@@ -1,22 +1,31 @@
 import time
 from langchain_core.messages import SystemMessage, HumanMessage
-from state import AgentState
+from state import AgentState, NodeOutput
 from models import llm_medium
-from nodes.helpers import log, _sla_exceeded, _truncate, llm_call
+from nodes.helpers import (
+    log, _sla_exceeded, _truncate, _first_human_content, _parse_data_needed, llm_call,
+)
 from nodes.prompts import PROJECT_MANAGER_PROMPT
 
 
-def project_manager_node(state: AgentState) -> AgentState:
+def project_manager_node(state: AgentState) -> NodeOutput:
     log.info("━━━ [NODE 1 / PROJECT MANAGER] Planning steps")
-    t0 = time.time()
+    t0 = time.perf_counter()
+
+    # Entry node — resolve the user message once so downstream nodes read it from state
+    user_msg = _first_human_content(state["messages"])
 
     if _sla_exceeded(state):
         log.warning("[PM] Skipping — SLA exceeded")
-        return {"messages": [], "pm_plan": "", "stream_chunks": [], "display_results": []}
+        return {
+            "messages": [],
+            "user_msg": user_msg,
+            "pm_plan": "",
+            "data_needed": "",
+            "stream_chunks": [],
+            "display_results": [],
+        }
 
-    user_msg = next(
-        (m.content for m in state["messages"] if isinstance(m, HumanMessage)), ""
-    )
     log.info(f"[PM] User message: {_truncate(user_msg, 100)}")
 
     plan = llm_call(
@@ -39,11 +48,13 @@ def project_manager_node(state: AgentState) -> AgentState:
         )
 
     log.info(f"[PM] Plan ({len(plan)} chars): {_truncate(plan, 200)}")
-    log.info(f"[PM] ✓ Done in {time.time() - t0:.2f}s")
+    log.info(f"[PM] ✓ Done in {time.perf_counter() - t0:.2f}s")
 
     return {
         "messages": [],
+        "user_msg": user_msg,
         "pm_plan": plan,
+        "data_needed": _parse_data_needed(plan),   # parsed once for researcher + responder
         "stream_chunks": [],
         "display_results": [],
     }
\ No newline at end of file
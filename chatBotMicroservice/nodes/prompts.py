@@ -5,7 +5,17 @@
 # to find, compare, and iterate on without touching node logic.
 # =============================================================================
 
-from tools import TOOL_LIST
+from nodes.helpers import RESEARCHER_MAX_PARALLEL_CALLS
+
+__all__ = [
+    "PROJECT_MANAGER_PROMPT",
+    "RESEARCHER_PLANNER_PROMPT_STATIC",
+    "RESEARCHER_HINT_NO_TOOLS",
+    "RESEARCHER_HINT_HAVE_TOOLS",
+    "DATA_PROCESSOR_PROMPT",
+    "RESPONSE_AGENT_BASE_PROMPT",
+    "VALIDATOR_PROMPT",
+]
 
 
 PROJECT_MANAGER_PROMPT = (
@@ -39,48 +49,52 @@ PROJECT_MANAGER_PROMPT = (
     "- Output ONLY the five labeled sections above.\n"
 )
 
-THINKER_PROMPT = (
-    "You are a thinking narrator. Read the plan below and summarize it into clear steps"
-    "in simple, conversational language as if thinking out loud. "
-    "Use first person: 'First I'll...', 'Then I need to...', "
-    "'I can see that...'. Keep it under 60 words. "
-    "Do not use bullet points or headers. "
-    "Never mention that you are reading a plan, never reference instructions or your process."
-)
-
-RESEARCHER_PLANNER_PROMPT = (
-    "You are a researcher that outputs ONE line only. No explanation. No repeating calls\n"
+# Static planner rules — kept free of per-iteration content so the prompt
+# prefix is byte-identical across calls. The state-dependent hint is sent
+# after it as a separate message.
+RESEARCHER_PLANNER_PROMPT_STATIC = (
+    "You are a researcher. Output one CALL line per tool you need "
+    f"(at most {RESEARCHER_MAX_PARALLEL_CALLS}), "
+    "or a single DONE line. No explanation. No repeating calls\n"
     "Format options:\n"
-    "  CALL: get_company_context | {{\"query\": \"<topic>\"}}\n"
-    "  CALL: get_stock_data | {{\"symbol\": \"<TICKER>\", \"function\": \"<FUNCTION>\"}}\n"
+    "  CALL: get_company_context | {\"query\": \"<topic>\"}\n"
+    "  CALL: get_stock_data | {\"symbol\": \"<TICKER>\", \"function\": \"<FUNCTION>\"}\n"
+    "  CALL: get_stock_data_batch | "
+    "{\"symbols\": [\"<TICKER>\", ...], \"function\": \"<FUNCTION>\"}\n"
     "  DONE\n"
-    "get_stock_data functions: OVERVIEW, GLOBAL_QUOTE, TIME_SERIES_DAILY, "
+    "get_stock_data(_batch) functions: OVERVIEW, GLOBAL_QUOTE, TIME_SERIES_DAILY, "
     "INCOME_STATEMENT, BALANCE_SHEET, CASH_FLOW, EARNINGS\n"
 )
 
-DISPLAY_FILL_PROMPT = (
-    "You are a precise data formatter. STRICTLY follow these rules:\n"
-    "- Output ONLY valid JSON (single object), matching the schema provided.\n"
-    "- The JSON must represent one chart only.\n"
-    "- For all graphs, the 'data' array must contain **one object per series**.\n"
-    "  - Each object must have:\n"
-    "    - 'x': a flat numeric array (timestamps or sequential values).\n"
-    "    - 'y': a flat numeric array of numbers (same length as x).\n"
-    "    - 'name': a string describing the series.\n"
-    "    - 'type': must always be 'scatter'.\n"
-    "    - 'mode': must be 'lines+markers'.\n"
-    "    - 'line': with a 'color' string.\n"
-    "- Do NOT combine multiple series into a single object.\n"
-    "- Do NOT output lists of names or lists of y-values inside a single object.\n"
-    "- Begin with '{' and end with '}' exactly, no trailing commas.\n"
-    "- Maintain all keys and nesting exactly as in the template.\n"
-    "- Include 7–28 data points per series.\n"
-    "- No markdown, explanations, or extra text.\n"
-    "\nInstructions for the agent:\n"
-    "1. Determine which chart type to create from the PM plan.\n"
-    "2. For each series, populate 'x', 'y', 'name', 'type', 'mode', and 'line.color' according to the schema.\n"
-    "3. Fill 'layout' with the appropriate 'title', 'xaxis', and 'yaxis'.\n"
-    "4. Ensure 'dynamic_traces' is set to true.\n"
+RESEARCHER_HINT_NO_TOOLS   = "You MUST output a CALL line. DONE is not valid."
+RESEARCHER_HINT_HAVE_TOOLS = "Output DONE only if results fully answer the question."
+
+# Display agent — extracts chart series as JSON; the chart object itself is
+# built deterministically in display_agent._build_chart_object.
+DATA_PROCESSOR_PROMPT = (
+    "You are a data extraction and organization assistant.\n"
+    "Given a user request and raw research context, extract and organize the relevant data.\n"
+    "Output ONLY valid JSON with this exact structure:\n"
+    "{\n"
+    '  "title": "string — descriptive chart title",\n'
+    '  "xaxis_label": "string — x axis label",\n'
+    '  "yaxis_label": "string — y axis label",\n'
+    '  "series": [\n'
+    "    {\n"
+    '      "name": "string — series name",\n'
+    '      "x": [1, 2, 3],\n'
+    '      "y": [1.2, 3.4, 5.6]\n'
+    "    }\n"
+    "  ]\n"
+    "}\n"
+    "Rules:\n"
+    "- x must be a flat 1D array of integers (e.g. years, indices)\n"
+    "- y must be a flat 1D array of numbers, matching x in length\n"
+    "- Each series gets its own object in the array\n"
+    "- 7–28 points per series\n"
+    "- If real data is available in context, use it. Otherwise use illustrative numeric values.\n"
+    "- No placeholder strings, no nulls, no nested arrays.\n"
+    "- Output ONLY the JSON object. No markdown, no explanation.\n"
 )
 
 RESPONSE_AGENT_BASE_PROMPT = (
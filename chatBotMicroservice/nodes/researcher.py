@@ -1,195 +1,477 @@
-import json
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
-from state import AgentState
+from state import AgentState, NodeOutput
+import models
 from models import llm_medium
-from tools import TOOL_MAP
+from tools import BATCH_SEPARATOR, TOOL_FUNCS, TOOL_PARAMS
 from nodes.helpers import (
-    log, _sla_exceeded, _truncate, llm_call,
-    DATA_NEEDED_EXTRACT,
+    log, _get_user_msg, _get_data_needed, _new_tool_id, _no_data_needed, _sla_exceeded, _truncate,
+    llm_call, stream_lines, stream_status,
     MAX_PROMPT_CHARS,
     RESEARCHER_MAX_ITERATIONS,
+    RESEARCHER_MAX_PARALLEL_CALLS,
+    RESEARCHER_SINGLE_SHOT,
     RESEARCHER_QUESTION_WINDOW,
     RESEARCHER_NEED_WINDOW,
     RESEARCHER_CONTEXT_WINDOW,
+    PLANNER_SEMANTIC_CACHE,
 )
-from nodes.prompts import RESEARCHER_PLANNER_PROMPT
+from nodes.prompts import (
+    RESEARCHER_PLANNER_PROMPT_STATIC,
+    RESEARCHER_HINT_NO_TOOLS,
+    RESEARCHER_HINT_HAVE_TOOLS,
+)
+from nodes.planner_cache import PlannerCache
+
+# Shared across calls so the static rules are sent as an identical prefix
+_PLANNER_STATIC_MSG = SystemMessage(content=RESEARCHER_PLANNER_PROMPT_STATIC)
+
+# Exact hits only unless PLANNER_SEMANTIC_CACHE is on; models.embedder is
+# built on first use, not at import
+_planner_cache = PlannerCache(
+    (lambda text: models.embedder.embed_query(text)) if PLANNER_SEMANTIC_CACHE else None
+)
+
+# Long-lived workers for batched CALL lines, shared by concurrent requests so a
+# planner step never pays thread start-up; sized to the HTTP connection pool
+_tool_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tool")
 
 
-# ─────────────────────────────────────────────────────────────
+# ────────────────────────────────
 # JSON SANITIZER
-# ─────────────────────────────────────────────────────────────
+# ────────────────────────────────
+
+_BARE_KEY_EQ     = re.compile(r'(\b\w+\b)\s*=')
+_BARE_KEY_COLON  = re.compile(r'(?<!")(\b\w+\b)\s*:')
+_TRAILING_COMMA  = re.compile(r",(\s*[}\]])")
+# Also matches '"limit": "5"' — tools are called without pydantic coercion
+_LIMIT_ARG       = re.compile(r"limit[\"']?\s*[=:]\s*[\"']?(\d+)", re.IGNORECASE)
+
+
+def _sanitize_fast(raw: str) -> str:
+    """Single-pass rewrite of LLM tool args into strict JSON.
+
+    Walks the string once: single-quoted strings become double-quoted, bare
+    keys followed by '=' or ':' become '"key":', and commas before a closing
+    bracket are dropped. Text inside strings is copied through untouched.
+    """
+    out: list[str] = []
+    i, n = 0, len(raw)
+    quote = None
+    while i < n:
+        ch = raw[i]
+        if quote:
+            if ch == "\\" and i + 1 < n:
+                out.append(raw[i:i + 2])
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':
+                out.append('\\"')   # literal " inside a single-quoted string
+            else:
+                out.append(ch)
+            i += 1
+        elif ch == '"' or ch == "'":
+            quote = ch
+            out.append('"')
+            i += 1
+        elif ch.isalnum() or ch == "_":
+            j = i + 1
+            while j < n and (raw[j].isalnum() or raw[j] == "_"):
+                j += 1
+            k = j
+            while k < n and raw[k].isspace():
+                k += 1
+            if k < n and raw[k] in "=:":
+                out.append(f'"{raw[i:j]}":')
+                i = k + 1
+            else:
+                out.append(raw[i:j])
+                i = j
+        elif ch == ",":
+            k = i + 1
+            while k < n and raw[k].isspace():
+                k += 1
+            if k >= n or raw[k] not in "}]":
+                out.append(ch)
+            i += 1
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def _sanitize_regex(raw: str) -> str:
+    raw = raw.replace("'", '"')
+    raw = _BARE_KEY_EQ.sub(r'"\1":', raw)
+    raw = _BARE_KEY_COLON.sub(r'"\1":', raw)
+    return _TRAILING_COMMA.sub(r"\1", raw)
+
 
 def _sanitize_tool_json(raw: str) -> dict:
     raw = raw.strip()
     try:
-        temp = json.loads(raw)
-        if isinstance(temp, dict) and "query" in temp and isinstance(temp["query"], str):
-            raw = temp["query"]
-    except Exception:
-        pass
-    raw = raw.replace("'", '"')
-    raw = re.sub(r'(\b\w+\b)\s*=', r'"\1":', raw)
-    raw = re.sub(r'(?<!")(\b\w+\b)\s*:', r'"\1":', raw)
-    raw = re.sub(r",(\s*[}\]])", r"\1", raw)
-    return json.loads(raw)
+        parsed = orjson.loads(raw)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        # Valid JSON needs no repair — unless the model wrapped the real args
+        # as a string under "query" (a plain query value is a real argument)
+        inner = parsed.get("query")
+        if not (isinstance(inner, str) and inner.lstrip().startswith("{")):
+            return parsed
+        raw = inner.strip()
+    try:
+        return orjson.loads(_sanitize_fast(raw))
+    except ValueError:
+        # Input the tokenizer can't repair — fall back to the regex passes
+        return orjson.loads(_sanitize_regex(raw))
+
+
+# Literal starts of the error strings tools.py (and _run_tool) return, plus raw
+# Alpha Vantage notice keys. Matched only at the start of a block, so phrases
+# like "not found" or "rate limit" inside article or report text don't count.
+_ERROR_PREFIXES = (
+    "Alpha Vantage error", "Alpha Vantage rate limit", "Alpha Vantage API notice",
+    "Request to Alpha Vantage timed out", "Network error", "Unexpected error",
+    "Error retrieving context", "Invalid ticker", "No symbols given", "Tool error",
+    "Error Message", "Note:", "Information:", "Thank you for using Alpha Vantage",
+    "rate limit",
+)
+# "No <kind> data found for …", "No Wikipedia article found …" and
+# "Wikipedia article '…' not found or empty." — checked on the first line only
+_ERROR_RE = re.compile(
+    r"\s*(?:" + "|".join(map(re.escape, _ERROR_PREFIXES)) + r"|No [^\n]*?\bfound\b"
+    r"|Wikipedia article '[^\n]*' not found)",
+    re.IGNORECASE,
+)
 
 
-def _is_tool_result_an_error(result: str) -> bool:
-    error_markers = [
-        "Error Message", "Thank you for using Alpha Vantage", "Information:",
-        "not found", "No content found", "rate limit", "timed out",
-        "Unexpected error", "Network error",
-    ]
-    return any(m.lower() in result.lower() for m in error_markers)
+def _block_is_error(block: str) -> bool:
+    return _ERROR_RE.match(block) is not None
 
 
-# ─────────────────────────────────────────────────────────────
+def _is_tool_result_an_error(result: str) -> bool:
+    """True when nothing usable came back — every block of a batch result failed."""
+    return all(map(_block_is_error, result.split(BATCH_SEPARATOR)))
+
+
+def _has_failed_block(result: str) -> bool:
+    """True when any block failed — a batch result that is only partly usable."""
+    return any(map(_block_is_error, result.split(BATCH_SEPARATOR)))
+
+
+# ────────────────────────────────
+# FAST ROUTES — DATA_NEEDED phrasings that map to one tool call
+# ────────────────────────────────
+
+# (pattern, get_stock_data function) — first match wins, so the statements
+# come before the generic "historical"/"price" phrasings ("historical income
+# statements" wants INCOME_STATEMENT, not daily prices).
+_FAST_ROUTES = [
+    (re.compile(r"income statement", re.I),           "INCOME_STATEMENT"),
+    (re.compile(r"balance sheet", re.I),              "BALANCE_SHEET"),
+    (re.compile(r"cash[\s-]?flow", re.I),             "CASH_FLOW"),
+    (re.compile(r"earnings|\bEPS\b", re.I),           "EARNINGS"),
+    (re.compile(r"historical|time[\s-]series|price history|daily (?:closing )?prices?", re.I),
+     "TIME_SERIES_DAILY"),
+    (re.compile(r"(?:current|latest|live) (?:stock )?price|stock quote", re.I),
+     "GLOBAL_QUOTE"),
+]
+# Only tickers written explicitly — "(AAPL)", "(NASDAQ: AAPL)" or "$AAPL" — are
+# trusted; bare capitalised words ("FY", "OHLC") are left to the planner
+_TICKER_CANDIDATE = re.compile(
+    r"\((?:[A-Z]+:\s*)?([A-Z]{1,5}(?:\.[A-Z]{1,2})?)\)|\$([A-Z]{1,5}(?:\.[A-Z]{1,2})?)\b"
+)
+_NOT_TICKERS = frozenset({
+    "A", "I", "AND", "OR", "FOR", "THE", "OF", "TO", "US", "USD", "CAD",
+    "EPS", "API", "ETF", "CEO", "AI", "GDP", "YTD", "TTM", "PE", "N",
+    "FY", "NYSE", "AMEX", "TSX", "LSE", "OTC", "OHLC", "OHLCV", "SEC", "IPO",
+})
+# "last 5 days", "past 3 years", … → the tool's limit argument
+_LIMIT_HINT = re.compile(
+    r"\b(?:last|past|previous|latest)\s+(\d{1,3})\s+"
+    r"(?:trading\s+)?(day|week|year|quarter|report)s?\b",
+    re.I,
+)
+# Units a function's limit counts — daily rows, annual reports, or EARNINGS'
+# annual and quarterly lists. Any other unit goes to the planner.
+_ANNUAL_UNITS = frozenset({"year", "report"})
+_LIMIT_UNITS = {
+    "TIME_SERIES_DAILY": frozenset({"day"}),
+    "INCOME_STATEMENT":  _ANNUAL_UNITS,
+    "BALANCE_SHEET":     _ANNUAL_UNITS,
+    "CASH_FLOW":         _ANNUAL_UNITS,
+    "EARNINGS":          _ANNUAL_UNITS | {"quarter"},
+}
+
+
+def _fast_route(data_needed: str) -> str | None:
+    """Map an unambiguous DATA_NEEDED line straight to a planner CALL line.
+
+    Only fires when exactly one explicit ticker is present and a route pattern
+    matches; anything else returns None and goes to the planner LLM. So does a
+    "last N <unit>" hint whose unit the function's limit does not count.
+    """
+    tickers = {
+        paren or dollar
+        for paren, dollar in _TICKER_CANDIDATE.findall(data_needed)
+        if (paren or dollar) not in _NOT_TICKERS
+    }
+    if len(tickers) != 1:
+        return None
+    for pattern, function in _FAST_ROUTES:
+        if pattern.search(data_needed):
+            args = {"symbol": tickers.pop(), "function": function}
+            limit_match = _LIMIT_HINT.search(data_needed)
+            if limit_match:
+                if limit_match.group(2).lower() not in _LIMIT_UNITS.get(function, ()):
+                    return None
+                args["limit"] = int(limit_match.group(1))
+            return f"CALL: get_stock_data | {orjson.dumps(args).decode()}"
+    return None
+
+
+def _parse_call(line: str) -> tuple[str, dict]:
+    """Parse 'CALL: <tool> | <args>' into (tool_name, tool_args). Raises on bad input."""
+    tool_name, args_str = line[5:].strip().split("|", 1)
+    tool_name = tool_name.strip()
+    args_str  = args_str.strip()
+
+    limit_match = _LIMIT_ARG.search(args_str)
+    limit = int(limit_match.group(1)) if limit_match else None
+
+    tool_args = _sanitize_tool_json(args_str)
+    if limit is not None:
+        tool_args["limit"] = limit
+    return tool_name, tool_args
+
+
+def _call_key(tool_name: str, tool_args) -> tuple[str, bytes]:
+    """Identity of a tool call — argument order does not matter."""
+    return tool_name, orjson.dumps(tool_args, option=orjson.OPT_SORT_KEYS)
+
+
+def _run_tool(tool_name: str, tool_args: dict, fn) -> str:
+    """Call a raw tool function and return its result as a string capped at MAX_PROMPT_CHARS.
+
+    Not cached here — tools.py caches each Alpha Vantage and Wikipedia fetch
+    itself, keyed per symbol, so batch and single calls share entries.
+    """
+    try:
+        if isinstance(tool_args, dict):
+            # Drop keys the planner invented, as StructuredTool validation did
+            params = TOOL_PARAMS[tool_name]
+            result = fn(**{k: v for k, v in tool_args.items() if k in params})
+        else:
+            result = fn(tool_args)
+        result_str = result if isinstance(result, str) else orjson.dumps(result).decode()
+        result_str = result_str[:MAX_PROMPT_CHARS]
+        log.info("[RESEARCHER] Tool '%s' returned: %.120s", tool_name, result_str)
+    except Exception as e:
+        log.error(f"[RESEARCHER] Tool error: {e}", exc_info=True)
+        result_str = f"Tool error: {str(e)}"
+    return result_str
+
+
+# ────────────────────────────────
 # RESEARCHER NODE
-# ─────────────────────────────────────────────────────────────
+# ────────────────────────────────
 
-def researcher_node(state: AgentState) -> AgentState:
+def researcher_node(state: AgentState) -> NodeOutput:
     log.info("━━━ [NODE 2B / RESEARCHER] Agentic research loop starting")
-    t0 = time.time()
+    t0 = time.perf_counter()
 
     if _sla_exceeded(state):
         log.warning("[RESEARCHER] Skipping — SLA exceeded")
         return {"messages": [], "stream_chunks": [], "data_fetched": False}
 
-    user_msg = next(
-        (m.content for m in state["messages"] if isinstance(m, HumanMessage)), ""
-    )
-    pm_plan = state.get("pm_plan", "")
-
-    data_needed_match = DATA_NEEDED_EXTRACT.search(pm_plan)
-    data_needed = data_needed_match.group(1).strip() if data_needed_match else ""
-    log.info(f"[RESEARCHER] DATA_NEEDED from plan: '{data_needed}'")
+    user_msg = _get_user_msg(state)
+    data_needed = _get_data_needed(state)
+    log.info("[RESEARCHER] DATA_NEEDED from plan: '%s'", data_needed)
 
-    if data_needed.lower() in ("none", "n/a", ""):
+    if _no_data_needed(data_needed):
         return {"messages": [], "stream_chunks": [], "data_fetched": True}
 
+    # Loop-invariant prompt pieces — slice once rather than every iteration
+    question_excerpt = user_msg[:RESEARCHER_QUESTION_WINDOW]
+    need_excerpt     = data_needed[:RESEARCHER_NEED_WINDOW]
+
     collected_results = []
-    all_tool_messages = []
-    all_ai_messages   = []
+    usable_results    = 0    # results that are not tool/API error messages
+    context_so_far    = ""   # "\n---\n"-joined result heads, rolled to the Have window
+    messages_out      = []   # each tool_call AIMessage followed by its ToolMessage
     iteration  = 0
     tool_called = False
+    malformed_retries = 1    # re-ask the planner once when nothing in its reply parses
 
     while iteration < RESEARCHER_MAX_ITERATIONS:
         if _sla_exceeded(state):
             break
-        if tool_called:
-            log.info("[RESEARCHER] Tool already called — stopping further iterations")
+        if RESEARCHER_SINGLE_SHOT and tool_called:
+            log.info(
+                "[RESEARCHER] Single-shot — tool already called, stopping further iterations"
+            )
             break
 
         iteration += 1
-        log.info(f"[RESEARCHER] Iteration {iteration}/{RESEARCHER_MAX_ITERATIONS}")
+        log.info("[RESEARCHER] Iteration %d/%d", iteration, RESEARCHER_MAX_ITERATIONS)
 
-        context_so_far = (
-            "\n---\n".join(collected_results)
+        have = (
+            context_so_far
             if collected_results
             else "NO TOOLS CALLED YET — you must make a CALL"
         )
-        no_tools_yet_hint = (
-            "You MUST output a CALL line. DONE is not valid."
-            if not collected_results
-            else "Output DONE only if results fully answer the question."
-        )
-
-        planner_system = RESEARCHER_PLANNER_PROMPT.format(
-            no_tools_yet_hint=no_tools_yet_hint
-        )
+        planner_hint = RESEARCHER_HINT_HAVE_TOOLS if collected_results else RESEARCHER_HINT_NO_TOOLS
         planner_user = (
-            f"Question: {user_msg[:RESEARCHER_QUESTION_WINDOW]}\n"
-            f"Need: {data_needed[:RESEARCHER_NEED_WINDOW]}\n"
-            f"Have: {context_so_far[:RESEARCHER_CONTEXT_WINDOW]}"
-        )
-
-        # ── Planner call via intermediary ─────────────────────────────────────
-        decision_raw = llm_call(
-            state,
-            llm_medium.invoke,
-            [
-                SystemMessage(content=planner_system),
-                HumanMessage(content=planner_user),
-            ],
-            status_before=f"🔍 Researching… (step {iteration})",
-            label="RESEARCHER-planner",
+            f"Question: {question_excerpt}\n"
+            f"Need: {need_excerpt}\n"
+            f"Have: {have}"
         )
 
-        if not decision_raw:
-            log.warning("[RESEARCHER] Planner returned empty — aborting loop")
-            break
-
-        decision = decision_raw.strip().splitlines()[0]
-        log.info(f"[RESEARCHER] Planner decision: {_truncate(decision, 150)}")
-
-        decision_upper = decision.upper()
-
-        if decision_upper.startswith("DONE"):
+        # ── Planner: fast route, then cached decision, LLM call on miss ───────
+        fast_decision = None if collected_results else _fast_route(data_needed)
+        if fast_decision is not None:
+            log.info("[RESEARCHER] Fast route — skipping planner LLM")
+            decision, planner_vec = fast_decision, None
+        else:
+            decision, planner_vec = _planner_cache.lookup(
+                planner_user, focus=f"Question: {question_excerpt}\nNeed: {need_excerpt}"
+            )
+
+        if decision is not None:
+            stream_status(state, f"🔍 Researching… (step {iteration})")
+        else:
+            decision_raw = llm_call(
+                state,
+                stream_lines(
+                    llm_medium,
+                    max_lines=RESEARCHER_MAX_PARALLEL_CALLS,
+                    line_prefix="CALL:",
+                ),
+                [
+                    _PLANNER_STATIC_MSG,
+                    SystemMessage(content=planner_hint),
+                    HumanMessage(content=planner_user),
+                ],
+                status_before=f"🔍 Researching… (step {iteration})",
+                label="RESEARCHER-planner",
+            )
+
+            if not decision_raw:
+                log.warning("[RESEARCHER] Planner returned empty — aborting loop")
+                break
+
+            decision = decision_raw.strip()
+
+        lines = [line for line in map(str.strip, decision.splitlines()) if line]
+        log.info("[RESEARCHER] Planner decision: %.150s", lines[0])
+
+        # Only the 5-char keyword is case-folded, not the whole line
+        head = lines[0][:5].upper()
+
+        if head.startswith("DONE"):
+            _planner_cache.store(planner_user, lines[0], planner_vec)
             break
 
-        if not decision_upper.startswith("CALL:"):
-            log.warning(f"[RESEARCHER] Invalid format: {decision}")
+        if head != "CALL:":
+            log.warning(f"[RESEARCHER] Invalid format: {lines[0]}")
+            if malformed_retries:
+                malformed_retries -= 1
+                continue
             break
 
-        # ── Parse tool call ───────────────────────────────────────────────────
-        try:
-            after_call = decision[5:].strip()
-            tool_name, args_str = after_call.split("|", 1)
-            tool_name = tool_name.strip()
-            args_str  = args_str.strip()
-
-            limit_match = re.search(r"limit\s*=\s*(\d+)", args_str, re.IGNORECASE)
-            limit = int(limit_match.group(1)) if limit_match else None
-
-            tool_args = _sanitize_tool_json(args_str)
-            if limit is not None:
-                tool_args["limit"] = limit
-
-            log.info(f"[RESEARCHER] Parsed call: {tool_name}({tool_args})")
-        except Exception as e:
-            log.warning(f"[RESEARCHER] Failed to parse tool args: {e}")
-            break
-
-        fn = TOOL_MAP.get(tool_name)
-        if not fn:
-            log.warning(f"[RESEARCHER] Unknown tool '{tool_name}'")
+        # ── Parse the leading block of CALL lines ───────────────
+        calls = []
+        seen_calls = set()   # small models often repeat a CALL line verbatim
+        for line in lines[:RESEARCHER_MAX_PARALLEL_CALLS]:
+            if line[:5].upper() != "CALL:":
+                break
+            try:
+                tool_name, tool_args = _parse_call(line)
+            except Exception as e:
+                log.warning(f"[RESEARCHER] Failed to parse tool args: {e}")
+                continue
+            fn = TOOL_FUNCS.get(tool_name)
+            if not fn:
+                log.warning(f"[RESEARCHER] Unknown tool '{tool_name}'")
+                continue
+            call_key = _call_key(tool_name, tool_args)
+            if call_key in seen_calls:
+                log.info("[RESEARCHER] Skipping duplicate call: %s(%s)", tool_name, tool_args)
+                continue
+            seen_calls.add(call_key)
+            log.info("[RESEARCHER] Parsed call: %s(%s)", tool_name, tool_args)
+            calls.append((line, tool_name, tool_args, fn))
+
+        if not calls:
+            if malformed_retries:
+                malformed_retries -= 1
+                log.warning("[RESEARCHER] No usable CALL lines — asking the planner again")
+                continue
             break
 
-        # ── Execute tool ──────────────────────────────────────────────────────
-        tool_id = f"tc_{tool_name}_{int(time.time()*1000)}_{iteration}"
-
-        all_ai_messages.append(AIMessage(content="", tool_calls=[{
-            "name": tool_name,
-            "args": tool_args,
-            "id": tool_id,
-            "type": "tool_call",
-        }]))
-
-        try:
-            result = fn.invoke(tool_args)
-            result_str = result if isinstance(result, str) else json.dumps(result)
-            log.info(f"[RESEARCHER] Tool '{tool_name}' returned: {_truncate(result_str, 120)}")
-        except Exception as e:
-            log.error(f"[RESEARCHER] Tool error: {e}", exc_info=True)
-            result_str = f"Tool error: {str(e)}"
-
-        trimmed = result_str[:MAX_PROMPT_CHARS]
-
-        all_tool_messages.append(ToolMessage(content=trimmed, tool_call_id=tool_id))
-        collected_results.append(trimmed)
+        if fast_decision is None:
+            _planner_cache.store(planner_user, "\n".join(c[0] for c in calls), planner_vec)
+
+        # ── Execute tools — concurrently when the planner batched calls ───────
+        ai_msgs = []
+        for _, tool_name, tool_args, _ in calls:
+            ai_msgs.append(AIMessage(content="", tool_calls=[{
+                "name": tool_name,
+                "args": tool_args,
+                "id": _new_tool_id(tool_name),
+                "type": "tool_call",
+            }]))
+
+        if len(calls) == 1:
+            results = [_run_tool(*calls[0][1:])]
+        else:
+            results = list(_tool_pool.map(lambda c: _run_tool(*c[1:]), calls))
+
+        usable_before = usable_results
+        for ai_msg, result_str in zip(ai_msgs, results):
+            messages_out.append(ai_msg)
+            messages_out.append(
+                ToolMessage(content=result_str, tool_call_id=ai_msg.tool_calls[0]["id"])
+            )
+            # Each result keeps its head (tool/ticker header, newest rows); the
+            # joined context rolls so the planner sees the latest results
+            head = result_str[:RESEARCHER_CONTEXT_WINDOW]
+            context_so_far = (
+                f"{context_so_far}\n---\n{head}"[-RESEARCHER_CONTEXT_WINDOW:]
+                if collected_results
+                else head
+            )
+            collected_results.append(result_str)
+            if _is_tool_result_an_error(result_str):
+                log.warning(f"[RESEARCHER] Tool returned an error: {_truncate(result_str, 120)}")
+            else:
+                if _has_failed_block(result_str):
+                    log.warning("[RESEARCHER] Batch partly failed: %.120s", result_str)
+                usable_results += 1
+
+        if fast_decision is not None and usable_results == usable_before:
+            # The guessed call failed — let the planner see the error and choose
+            log.warning("[RESEARCHER] Fast route failed — handing over to the planner")
+            continue
         tool_called = True
 
-    data_fetched = len(collected_results) > 0
+    data_fetched = usable_results > 0
 
     log.info(
-        f"[RESEARCHER] ✓ Done in {time.time()-t0:.2f}s | "
+        f"[RESEARCHER] ✓ Done in {time.perf_counter()-t0:.2f}s | "
         f"{iteration} iteration(s) | {len(collected_results)} result(s)"
     )
 
     return {
-        "messages": all_ai_messages + all_tool_messages,
+        "messages": messages_out,
+        "tool_context": "\n\n".join(r for r in collected_results if r),
         "stream_chunks": [],
         "data_fetched": data_fetched,
     }
\ No newline at end of file
@@ -1,37 +1,56 @@
+import hashlib
 import time
 from langchain_core.messages import SystemMessage, HumanMessage
-from state import AgentState
+from state import AgentState, NodeOutput
 from models import llm_respond
+from cache import TTLCache
 from nodes.helpers import (
-    log, _sla_exceeded, _truncate, llm_call,
-    DATA_NEEDED_EXTRACT,
+    log, _get_user_msg, _get_data_needed, _no_data_needed, _sla_exceeded, _truncate, llm_call,
+    stream_tokens,
     RESPOND_TOOL_CONTEXT_WINDOW,
     RESPOND_PM_PLAN_WINDOW,
-    _extract_tool_context,
+    RESPONSE_CACHE_TTL_SECS,
+    _get_tool_context,
     emit,
 )
 from nodes.prompts import RESPONSE_AGENT_BASE_PROMPT
 
+# Final answers keyed on a digest of the exact prompt (system text + user turn)
+_response_cache = TTLCache(RESPONSE_CACHE_TTL_SECS, max_entries=512)
 
-def response_agent_node(state: AgentState) -> AgentState:
+
+_EMPTY_FALLBACK = "I wasn't able to generate a response. Please try again."
+
+
+def _is_placeholder(text: str) -> bool:
+    """True for empty output or the model's "No output generated" stand-in."""
+    return not text or text.lower().startswith("no output generated")
+
+
+def _prompt_digest(system_text: str, user_turn: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(system_text.encode())
+    h.update(b"\0")
+    h.update(user_turn.encode())
+    return h.digest()
+
+
+def response_agent_node(state: AgentState) -> NodeOutput:
     log.info("━━━ [NODE 4 / RESPONSE AGENT] Generating final answer")
-    t0 = time.time()
+    t0 = time.perf_counter()
 
     if _sla_exceeded(state):
         log.warning("[RESPOND] SLA exceeded — returning fallback")
+        content = "I wasn't able to complete your request in time. Please try again."
         return {
             "messages": [],
-            "stream_chunks": [emit(
-                "response_content",
-                "I wasn't able to complete your request in time. Please try again."
-            )],
+            "final_response": content,
+            "stream_chunks": [emit("response_content", content)],
         }
 
-    user_msg = next(
-        (m.content for m in state["messages"] if isinstance(m, HumanMessage)), ""
-    )
+    user_msg = _get_user_msg(state)
     pm_plan     = state.get("pm_plan", "")
-    tool_context = _extract_tool_context(state["messages"])
+    tool_context = _get_tool_context(state)
     data_fetched = state.get("data_fetched", True)
 
     log.info(
@@ -41,9 +60,7 @@ def response_agent_node(state: AgentState) -> AgentState:
     )
 
     # ── Short-circuit if data was required but nothing came back ──────────────
-    data_needed_match = DATA_NEEDED_EXTRACT.search(pm_plan)
-    data_needed  = data_needed_match.group(1).strip() if data_needed_match else ""
-    needs_data   = data_needed.lower() not in ("none", "n/a", "")
+    needs_data   = not _no_data_needed(_get_data_needed(state))
 
     if needs_data and not data_fetched:
         log.warning("[RESPOND] Data was required but not fetched — returning honest failure")
@@ -53,6 +70,7 @@ def response_agent_node(state: AgentState) -> AgentState:
         )
         return {
             "messages": [],
+            "final_response": content,
             "stream_chunks": [emit("response_content", content)],
         }
 
@@ -75,17 +93,31 @@ def response_agent_node(state: AgentState) -> AgentState:
     if pm_plan:
         user_turn += f"\n\n[Execution plan for context]:\n{pm_plan[:RESPOND_PM_PLAN_WINDOW]}"
 
+    system_text = "\n".join(system_parts)
     log.info(
         f"[RESPOND] Calling llm_respond — "
-        f"{len(chr(10).join(system_parts))} char system, {len(user_turn)} char user turn"
+        f"{len(system_text)} char system, {len(user_turn)} char user turn"
     )
 
-    # ── LLM call via intermediary ─────────────────────────────────────────────
+    # ── Cached answer ────────────────────────
+    # Same prompt answered moments ago — reuse it and skip the LLM
+    cache_key = _prompt_digest(system_text, user_turn)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        log.info("[RESPOND] Serving cached answer")
+        return {
+            "messages": [],
+            "final_response": cached,
+            "stream_chunks": [emit("response_content", cached)],
+        }
+
+    # ── LLM call via intermediary — tokens stream to the client as generated ──
+    stream = stream_tokens(llm_respond, state)
     content = llm_call(
         state,
-        llm_respond.invoke,
+        stream,
         [
-            SystemMessage(content="\n".join(system_parts)),
+            SystemMessage(content=system_text),
             HumanMessage(content=user_turn),
         ],
         status_before="✍️ Generating response…",
@@ -93,14 +125,31 @@ def response_agent_node(state: AgentState) -> AgentState:
         label="RESPOND",
     ).strip()
 
-    if not content or content.lower().startswith("no output generated"):
+    # Text the client has already shown — it decides whether a fallback is sent
+    streamed = stream.emitted.strip()
+
+    if _is_placeholder(content):
         log.warning(f"[RESPOND] Model returned empty/invalid output: {repr(content)}")
-        content = "I wasn't able to generate a response. Please try again."
+        if not _is_placeholder(streamed):
+            # Stream failed partway — what the client has is the answer
+            content = streamed
+            stream_chunks = []
+        else:
+            content = _EMPTY_FALLBACK
+            # A streamed placeholder stays on screen; start the fallback below it
+            stream_chunks = [emit("response_content", f"\n\n{content}" if streamed else content)]
+    else:
+        _response_cache.set(cache_key, content)
+        # Streamed tokens already reached the client; only unstreamed text is flushed
+        stream_chunks = [] if streamed else [emit("response_content", content)]
 
-    stream_chunks = [emit("response_content", content)]
-    log.info(f"[RESPOND] ✓ Done in {time.time() - t0:.2f}s | {len(stream_chunks)} chunk(s)")
+    log.info(
+        f"[RESPOND] ✓ Done in {time.perf_counter() - t0:.2f}s | "
+        f"{len(stream_chunks)} chunk(s)"
+    )
 
     return {
         "messages": [],
+        "final_response": content,
         "stream_chunks": stream_chunks,
     }
\ No newline at end of file
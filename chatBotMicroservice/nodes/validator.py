@@ -1,11 +1,10 @@
-import json
-import re
 import time
+import orjson
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from state import AgentState
-from models import llm_fast
+from state import AgentState, NodeOutput
+import models
 from nodes.helpers import (
-    log, _llm_text,
+    log, _get_user_msg, _llm_text,
     GRAPH_SLA_SECS,
     VALIDATOR_QUESTION_WINDOW,
     VALIDATOR_RESPONSE_WINDOW,
@@ -13,8 +12,21 @@ from nodes.helpers import (
 from nodes.prompts import VALIDATOR_PROMPT
 
 
-def validator_node(state: AgentState) -> AgentState:
-    elapsed = time.time() - state.get("start_time", time.time())
+def _strip_fences(text: str) -> str:
+    """Return the body of a ```-fenced reply (language tag dropped), else text stripped."""
+    start = text.find("```")
+    if start == -1:
+        return text.strip()
+    end = text.rfind("```")
+    body = text[start + 3:end] if end > start else text[start + 3:]
+    tag, newline, rest = body.partition("\n")
+    if newline and (not tag.strip() or tag.strip().isalpha()):
+        body = rest
+    return body.strip()
+
+
+def validator_node(state: AgentState) -> NodeOutput:
+    elapsed = time.monotonic() - state.get("start_time", time.monotonic())
     remaining = GRAPH_SLA_SECS - elapsed
     log.info(f"━━━ [NODE 5 / VALIDATOR] | {elapsed:.1f}s elapsed | {remaining:.1f}s remaining")
 
@@ -31,15 +43,13 @@ def validator_node(state: AgentState) -> AgentState:
             "display_results": [],
         }
 
-    user_msg = next(
-        (m.content for m in state["messages"] if isinstance(m, HumanMessage)), ""
-    )
+    user_msg = _get_user_msg(state)
 
-    last_response = ""
-    for msg in reversed(state["messages"]):
-        if isinstance(msg, AIMessage) and msg.content:
-            last_response = msg.content
-            break
+    # Cached by the response agent; scan only when run outside the full graph
+    last_response = state.get("final_response") or next(
+        (m.content for m in reversed(state["messages"]) if isinstance(m, AIMessage) and m.content),
+        "",
+    )
 
     log.info(f"[VALIDATOR] Checking response ({len(last_response)} chars) | retry_count: {retry_count}")
 
@@ -56,10 +66,10 @@ def validator_node(state: AgentState) -> AgentState:
 
     result = "pass"
     critique = ""
-    t0 = time.time()
+    t0 = time.perf_counter()
 
     try:
-        verdict = llm_fast.invoke([
+        verdict = models.llm_fast.invoke([
             SystemMessage(content=VALIDATOR_PROMPT),
             HumanMessage(content=(
                 f"User question: {user_msg[:VALIDATOR_QUESTION_WINDOW]}\n\n"
@@ -67,14 +77,14 @@ def validator_node(state: AgentState) -> AgentState:
             )),
         ])
         verdict_text = _llm_text(verdict)
-        raw = re.sub(r"```[a-z]*\n?", "", verdict_text or "{}").strip().rstrip("`")
+        raw = _strip_fences(verdict_text or "{}")
         log.info(f"[VALIDATOR] Raw LLM output: {repr(raw[:120])}")
-        parsed = json.loads(raw)
+        parsed = orjson.loads(raw)
         result = parsed.get("result", "pass").lower()
         critique = parsed.get("critique", "")
         if result not in ("pass", "fail"):
             result = "pass"
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         log.warning(f"[VALIDATOR] JSON parse failed: {e} — defaulting to fail")
         result = "fail"
         critique = "Validator could not parse LLM output."
@@ -86,7 +96,7 @@ def validator_node(state: AgentState) -> AgentState:
     new_retry = retry_count + (1 if result == "fail" else 0)
     log.info(
         f"[VALIDATOR] ✓ {result.upper()} | '{critique}' | "
-        f"{time.time()-t0:.2f}s | retries: {retry_count} → {new_retry}"
+        f"{time.perf_counter()-t0:.2f}s | retries: {retry_count} → {new_retry}"
     )
 
     if result == "fail" and new_retry >= 2:
@@ -6,14 +6,42 @@ def merge_lists(left: list, right: list) -> list:
     return (left or []) + (right or [])
 
 
+# response_agent and display_agent run as parallel branches after the
+# researcher and commit their updates in the same step. Fields both branches
+# write (messages, stream_chunks, display_results) need a reducer; every other
+# field must be written by at most one branch, or LangGraph raises
+# InvalidUpdateError (response_agent owns final_response, display_agent owns
+# display_failed).
 class AgentState(TypedDict):
     messages:            Annotated[list, add_messages]
+    user_msg:            str
     pm_plan:             str
+    data_needed:         str
+    final_response:      str
+    tool_context:        str
     stream_chunks:       Annotated[list, merge_lists]
     display_results:     Annotated[list, merge_lists]
     data_fetched:        bool
     evaluation:          str
     evaluation_critique: str
     retry_count:         int
+    display_failed:      bool
     token_queue:         Any
-    start_time:          float
+    start_time:          float   # time.monotonic() at request start
+
+
+class NodeOutput(TypedDict, total=False):
+    """Partial state update returned by a node and merged into AgentState."""
+    messages:            list
+    user_msg:            str
+    pm_plan:             str
+    data_needed:         str
+    final_response:      str
+    tool_context:        str
+    stream_chunks:       list
+    display_results:     list
+    data_fetched:        bool
+    evaluation:          str
+    evaluation_critique: str
+    retry_count:         int
+    display_failed:      bool
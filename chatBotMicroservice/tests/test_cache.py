@@ -0,0 +1,38 @@
+"""
+Tests for cache.py — TTL + LRU result cache.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cache
+from cache import TTLCache
+
+
+def test_get_returns_stored_value():
+    c = TTLCache(ttl=60)
+    c.set(("get_stock_data", b"{}"), "data")
+    assert c.get(("get_stock_data", b"{}")) == "data"
+    assert c.get("missing") is None
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    c = TTLCache(ttl=60)
+    c.set("k", "v")
+    now[0] += 59
+    assert c.get("k") == "v"
+    now[0] += 2
+    assert c.get("k") is None
+
+
+def test_lru_eviction():
+    c = TTLCache(ttl=60, max_entries=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")          # refresh "a" so "b" is the oldest
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
@@ -0,0 +1,58 @@
+"""
+Tests for nodes/display_agent.py — deterministic chart building (no LLM calls).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from nodes import display_agent
+from nodes.display_agent import COLORS, _build_chart_object, _specialized_builder
+
+
+def _organized(n_series: int) -> dict:
+    series = [
+        {"x": [1, 2, 3], "y": [1.5 * i, 2.5 * i, 3.5 * i], "name": f"s{i}"}
+        for i in range(n_series)
+    ]
+    series[0].pop("name")  # exercise the default "Series N" name
+    return {"title": "T", "xaxis_label": "X", "yaxis_label": "Y", "series": series}
+
+
+def _generic(monkeypatch, graph_type: str, organized_data: dict) -> dict:
+    # Force the fallback loop by hiding the specialized builder
+    with monkeypatch.context() as m:
+        m.setattr(display_agent, "_specialized_builder", lambda *_: None)
+        return _build_chart_object(graph_type, organized_data)
+
+
+# =============================================================================
+# _build_chart_object — specialized builders match the generic loop
+# =============================================================================
+
+@pytest.mark.parametrize("graph_type", ["LineGraph", "BarGraph", "ScatterPlot"])
+@pytest.mark.parametrize("n_series", [1, 3, len(COLORS), len(COLORS) + 1])
+def test_specialized_matches_generic(monkeypatch, graph_type, n_series):
+    data = _organized(n_series)
+    assert _build_chart_object(graph_type, data) == _generic(monkeypatch, graph_type, data)
+
+
+def test_specialized_builder_is_cached():
+    assert _specialized_builder("LineGraph", 2) is _specialized_builder("LineGraph", 2)
+
+
+def test_specialized_builder_unknown_shape():
+    assert _specialized_builder("PieChart", 1) is None
+    assert _specialized_builder("LineGraph", len(COLORS) + 1) is None
+
+
+def test_bar_graph_stringifies_x():
+    chart = _build_chart_object("BarGraph", _organized(1))
+    assert chart["data"][0]["x"] == ["1", "2", "3"]
+    assert chart["data"][0]["name"] == "Series 1"
+
+
+def test_missing_series_raises():
+    with pytest.raises(ValueError):
+        _build_chart_object("LineGraph", {"series": []})
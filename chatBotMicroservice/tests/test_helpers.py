@@ -0,0 +1,229 @@
+"""
+Tests for nodes/helpers.py — pure helpers shared across graph nodes.
+"""
+import json
+import queue
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.messages import (
+    SystemMessage, HumanMessage, AIMessage, AIMessageChunk, ToolMessage,
+)
+
+from nodes.helpers import (
+    _first_human_content, _get_data_needed, _get_user_msg, _get_tool_context, _new_tool_id,
+    _no_data_needed, stream_lines, stream_tokens,
+)
+
+
+# =============================================================================
+# _first_human_content
+# =============================================================================
+
+def test_first_human_content_skips_system():
+    messages = [SystemMessage(content="sys"), HumanMessage(content="hello")]
+    assert _first_human_content(messages) == "hello"
+
+
+def test_first_human_content_returns_first_match():
+    messages = [
+        HumanMessage(content="first"),
+        AIMessage(content="reply"),
+        HumanMessage(content="second"),
+    ]
+    assert _first_human_content(messages) == "first"
+
+
+def test_first_human_content_empty():
+    assert _first_human_content([]) == ""
+    assert _first_human_content([SystemMessage(content="sys")]) == ""
+
+
+# =============================================================================
+# _get_user_msg
+# =============================================================================
+
+def test_get_user_msg_prefers_cached_field():
+    state = {"user_msg": "cached", "messages": [HumanMessage(content="scanned")]}
+    assert _get_user_msg(state) == "cached"
+
+
+def test_get_user_msg_falls_back_to_scan():
+    state = {"messages": [SystemMessage(content="sys"), HumanMessage(content="scanned")]}
+    assert _get_user_msg(state) == "scanned"
+
+
+# =============================================================================
+# _get_tool_context
+# =============================================================================
+
+def test_get_tool_context_prefers_cached_field():
+    state = {
+        "tool_context": "cached",
+        "messages": [ToolMessage(content="scanned", tool_call_id="t")],
+    }
+    assert _get_tool_context(state) == "cached"
+
+
+def test_get_tool_context_falls_back_to_scan():
+    state = {"messages": [
+        HumanMessage(content="q"),
+        ToolMessage(content="a", tool_call_id="t1"),
+        ToolMessage(content="", tool_call_id="t2"),
+        ToolMessage(content="b", tool_call_id="t3"),
+    ]}
+    assert _get_tool_context(state) == "a\n\nb"
+
+
+# =============================================================================
+# stream_lines
+# =============================================================================
+
+class _FakeStreamingLLM:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+
+    def stream(self, messages):
+        for c in self.chunks:
+            self.consumed += 1
+            yield AIMessageChunk(content=c)
+
+
+def test_stream_lines_stops_after_newline():
+    llm = _FakeStreamingLLM(["CALL: get_", "stock_data | {}", "\nextra", " tokens", "\nmore"])
+    resp = stream_lines(llm)([])
+    assert resp.content.strip().splitlines()[0] == "CALL: get_stock_data | {}"
+    assert llm.consumed == 3
+
+
+def test_stream_lines_skips_leading_blank_lines():
+    llm = _FakeStreamingLLM(["\n", "  \nDO", "NE\n", "ignored"])
+    resp = stream_lines(llm)([])
+    assert resp.content.strip().splitlines()[0] == "DONE"
+    assert llm.consumed == 3
+
+
+def test_stream_lines_without_newline():
+    llm = _FakeStreamingLLM(["DONE"])
+    assert stream_lines(llm)([]).content == "DONE"
+
+
+def test_stream_lines_stops_at_max_lines():
+    llm = _FakeStreamingLLM(["CALL: a | {}\n", "CALL: b | {}\n", "CALL: c | {}\n"])
+    resp = stream_lines(llm, max_lines=2, line_prefix="CALL:")([])
+    assert resp.content.splitlines() == ["CALL: a | {}", "CALL: b | {}"]
+    assert llm.consumed == 2
+
+
+def test_stream_lines_stops_at_first_line_without_prefix():
+    llm = _FakeStreamingLLM(["CALL: a | {}\n", "Sure, here you go\n", "CALL: b | {}\n"])
+    resp = stream_lines(llm, max_lines=3, line_prefix="CALL:")([])
+    assert llm.consumed == 2
+    assert resp.content.splitlines()[0] == "CALL: a | {}"
+
+
+# =============================================================================
+# _new_tool_id
+# =============================================================================
+
+def test_new_tool_id_is_unique_and_prefixed():
+    ids = {_new_tool_id("get_stock_data") for _ in range(100)}
+    assert len(ids) == 100
+    assert all(i.startswith("tc_get_stock_data_") for i in ids)
+
+
+# =============================================================================
+# _get_data_needed
+# =============================================================================
+
+def test_get_data_needed_prefers_cached_field():
+    state = {"data_needed": "cached", "pm_plan": "DATA_NEEDED: parsed"}
+    assert _get_data_needed(state) == "cached"
+
+
+def test_get_data_needed_falls_back_to_plan():
+    state = {"pm_plan": "STEPS:\n1. x\n\n**DATA_NEEDED:**\n- prices for AAPL\nOUTPUT_FORMAT: text"}
+    assert _get_data_needed(state) == "- prices for AAPL"
+    assert _get_data_needed({}) == ""
+
+
+# =============================================================================
+# _no_data_needed
+# =============================================================================
+
+def test_no_data_needed_variants():
+    for value in ("", "none", "  NONE  ", "None.", "- none", "**None**", "N/A", "not required"):
+        assert _no_data_needed(value), value
+
+
+def test_no_data_needed_real_request():
+    assert not _no_data_needed("daily prices for AAPL")
+    assert not _no_data_needed("none of the above, fetch AAPL overview")
+
+
+# =============================================================================
+# stream_tokens
+# =============================================================================
+
+def _drain(q: queue.Queue) -> list[str]:
+    return [json.loads(q.get_nowait())["data"] for _ in range(q.qsize())]
+
+
+def test_stream_tokens_coalesces_deltas():
+    q = queue.Queue()
+    llm = _FakeStreamingLLM(["\n ", " Hello", " world", "", "."])
+    resp = stream_tokens(llm, {"token_queue": q}, flush_secs=60)([])
+    assert resp.content == "Hello world."
+    assert _drain(q) == ["Hello world."]
+
+
+def test_stream_tokens_flushes_every_n_deltas():
+    q = queue.Queue()
+    llm = _FakeStreamingLLM(["a", "b", "c", "d", "e"])
+    stream_tokens(llm, {"token_queue": q}, flush_tokens=2, flush_secs=60)([])
+    assert _drain(q) == ["ab", "cd", "e"]
+
+
+def test_stream_tokens_flushes_on_time():
+    q = queue.Queue()
+    llm = _FakeStreamingLLM(["a", "b", "c"])
+    stream_tokens(llm, {"token_queue": q}, flush_secs=0)([])
+    assert _drain(q) == ["a", "b", "c"]
+
+
+def test_stream_tokens_without_queue():
+    llm = _FakeStreamingLLM(["Hi", " there"])
+    assert stream_tokens(llm, {})([]).content == "Hi there"
+
+
+class _FailingStreamingLLM(_FakeStreamingLLM):
+    def stream(self, messages):
+        yield from super().stream(messages)
+        raise ConnectionError("stream dropped")
+
+
+def test_stream_tokens_records_emitted_text_on_failure():
+    q = queue.Queue()
+    stream = stream_tokens(
+        _FailingStreamingLLM(["Hello", " wor"]), {"token_queue": q}, flush_secs=0
+    )
+    try:
+        stream([])
+    except ConnectionError:
+        pass
+    assert stream.emitted == "Hello wor"
+    assert _drain(q) == ["Hello", " wor"]
+
+
+def test_stream_tokens_emitted_empty_without_queue():
+    stream = stream_tokens(_FakeStreamingLLM(["Hi"]), {})
+    stream([])
+    assert stream.emitted == ""
+
+
+def test_planner_prompt_states_parallel_call_limit():
+    from nodes.helpers import RESEARCHER_MAX_PARALLEL_CALLS
+    from nodes.prompts import RESEARCHER_PLANNER_PROMPT_STATIC
+    assert f"(at most {RESEARCHER_MAX_PARALLEL_CALLS})" in RESEARCHER_PLANNER_PROMPT_STATIC
@@ -0,0 +1,90 @@
+"""
+Tests for nodes/planner_cache.py — exact and semantic planner decision reuse.
+Uses a deterministic fake embedder, so no Ollama server is needed.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodes.planner_cache import PlannerCache
+
+
+def _bag_of_words(text: str) -> list[float]:
+    vocab = ["question", "need", "have", "price", "daily", "prices", "history", "for", "of"]
+    words = text.lower().replace(":", " ").split()
+    return [float(words.count(w)) for w in vocab]
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    cache = PlannerCache(embed=None)
+    cache.store("Question: price of AAPL", "CALL: x | {}")
+    decision, _ = cache.lookup("question:   price of AAPL")
+    assert decision == "CALL: x | {}"
+
+
+def test_miss_returns_none():
+    cache = PlannerCache(embed=None)
+    assert cache.lookup("anything") == (None, None)
+
+
+def test_semantic_hit_above_threshold():
+    cache = PlannerCache(embed=_bag_of_words, threshold=0.85)
+    text = "Question: daily prices for AAPL"
+    _, vec = cache.lookup(text)
+    cache.store(text, "DONE", vec)
+    decision, _ = cache.lookup("Question: show me the daily prices for aapl")
+    assert decision == "DONE"
+
+
+def test_semantic_hit_requires_same_content_words():
+    # Embeddings put these close together; the content-word guard keeps them apart
+    cache = PlannerCache(embed=lambda _text: [1.0, 0.0], threshold=0.5)
+    text = "Question: income statement for Apple"
+    _, vec = cache.lookup(text)
+    cache.store(text, "CALL: get_stock_data | {}", vec)
+    assert cache.lookup("Question: balance sheet for Apple")[0] is None
+    assert cache.lookup("Question: Income Statement of apple")[0] is not None
+
+
+def test_semantic_lookup_embeds_focus_only():
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return [1.0]
+
+    cache = PlannerCache(embed=embed)
+    cache.lookup("Question: q\nNeed: n\nHave: long tool output", focus="Question: q\nNeed: n")
+    assert embedded == ["Question: q\nNeed: n"]
+
+
+def test_semantic_hit_requires_same_identifiers():
+    cache = PlannerCache(embed=_bag_of_words, threshold=0.5)
+    text = "Question: daily prices for AAPL"
+    _, vec = cache.lookup(text)
+    cache.store(text, "CALL: get_stock_data | {\"symbol\": \"AAPL\"}", vec)
+    decision, _ = cache.lookup("Question: daily prices for MSFT")
+    assert decision is None
+
+
+def test_embedding_failure_falls_back_to_exact(caplog):
+    def boom(_text):
+        raise ConnectionError("ollama down")
+
+    cache = PlannerCache(embed=boom)
+    cache.store("q", "DONE")
+    assert cache.lookup("q")[0] == "DONE"
+    assert cache.lookup("other") == (None, None)
+    assert cache.lookup("another") == (None, None)
+    assert sum(r.levelname == "WARNING" for r in caplog.records) == 1
+
+
+def test_lru_eviction():
+    cache = PlannerCache(embed=None, max_entries=2)
+    cache.store("a", "1")
+    cache.store("b", "2")
+    cache.lookup("a")          # refresh "a" so "b" is the oldest
+    cache.store("c", "3")
+    assert cache.lookup("b")[0] is None
+    assert cache.lookup("a")[0] == "1"
+    assert cache.lookup("c")[0] == "3"
@@ -0,0 +1,80 @@
+"""
+Tests for nodes/response_agent.py — fallback handling around streamed answers.
+Uses fake streaming LLMs, so no Ollama server is needed.
+"""
+import json
+import queue
+import sys
+import os
+import time
+from functools import partial
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.messages import AIMessageChunk
+
+from cache import TTLCache
+from nodes import response_agent
+from nodes.helpers import stream_tokens
+
+
+class _FakeStreamingLLM:
+    def __init__(self, chunks, fail=False):
+        self.chunks = chunks
+        self.fail = fail
+
+    def stream(self, messages):
+        for c in self.chunks:
+            yield AIMessageChunk(content=c)
+        if self.fail:
+            raise ConnectionError("stream dropped")
+
+
+def _run(monkeypatch, llm, with_queue=True):
+    monkeypatch.setattr(response_agent, "llm_respond", llm)
+    monkeypatch.setattr(response_agent, "_response_cache", TTLCache(60))
+    # Flush every delta so a mid-stream failure leaves text on the client
+    monkeypatch.setattr(response_agent, "stream_tokens", partial(stream_tokens, flush_secs=0))
+    q = queue.Queue()
+    state = {
+        "messages": [], "user_msg": "hi", "data_needed": "none", "pm_plan": "",
+        "start_time": time.monotonic(), "token_queue": q if with_queue else None,
+    }
+    out = response_agent.response_agent_node(state)
+    answers = []
+    while not q.empty():
+        item = q.get_nowait()
+        if item.startswith("{") and json.loads(item)["type"] == "response_content":
+            answers.append(json.loads(item)["data"])
+    return out, answers
+
+
+# =============================================================================
+# Fallback is sent only when nothing was streamed
+# =============================================================================
+
+def test_stream_failure_midway_keeps_partial_answer(monkeypatch):
+    out, answers = _run(monkeypatch, _FakeStreamingLLM(["Partial ", "answer"], fail=True))
+    assert "".join(answers) == "Partial answer"
+    assert out["stream_chunks"] == []
+    assert out["final_response"] == "Partial answer"
+
+
+def test_streamed_no_output_marker_gets_fallback_below_it(monkeypatch):
+    out, answers = _run(monkeypatch, _FakeStreamingLLM(["No output generated."]))
+    fallback = "I wasn't able to generate a response. Please try again."
+    assert answers == ["No output generated."]
+    assert json.loads(out["stream_chunks"][0])["data"] == f"\n\n{fallback}"
+    assert out["final_response"] == fallback
+
+
+def test_fallback_sent_when_nothing_streamed(monkeypatch):
+    out, answers = _run(monkeypatch, _FakeStreamingLLM([], fail=True))
+    assert answers == []
+    assert out["final_response"] == "I wasn't able to generate a response. Please try again."
+    assert len(out["stream_chunks"]) == 1
+
+
+def test_unstreamed_answer_is_flushed(monkeypatch):
+    out, answers = _run(monkeypatch, _FakeStreamingLLM(["Hi there"]), with_queue=False)
+    assert out["final_response"] == "Hi there"
+    assert len(out["stream_chunks"]) == 1
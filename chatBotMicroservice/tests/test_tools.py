@@ -74,3 +74,569 @@ def test_error_detection_clean_result():
 
 def test_error_detection_no_article():
     assert _is_tool_result_an_error("No Wikipedia article found for 'XYZNOTREAL'.") is True
+
+
+def test_error_detection_ignores_case():
+    assert _is_tool_result_an_error("RATE LIMIT EXCEEDED") is True
+
+
+def test_error_detection_covers_tool_error_strings():
+    # Every error string tools.py returns must be recognised
+    for result in (
+        "Alpha Vantage API notice: premium endpoint",
+        "No quote data found for 'XYZ'.",
+        "No daily price data found for 'XYZ'.",
+        "No income statement data found for 'XYZ'.",
+        "Wikipedia article 'Foo' not found or empty.",
+        "Request to Alpha Vantage timed out for 'XYZ'.",
+        "Invalid ticker symbol 'apple inc'.",
+        "No data found for 'ZZZZ' (OVERVIEW).",
+        "No content found for 'Foo'.",
+        "No symbols given for batch stock lookup.",
+        "Network error fetching data for 'XYZ': reset",
+        "Unexpected error fetching stock data for 'XYZ': boom",
+        "Error retrieving context: boom",
+        "Tool error: bad args",
+    ):
+        assert _is_tool_result_an_error(result) is True, result
+
+
+def test_error_detection_ignores_marker_phrases_in_bodies():
+    for result in (
+        "[Wikipedia: Foo]\n\nFoo's founder was not found guilty of fraud.",
+        "[Alpha Vantage: FOO Overview]\nDescription: Hit a rate limit of growth in 2023.",
+        "Foo Corp reported strong results.\nNo guidance found for next year.",
+    ):
+        assert _is_tool_result_an_error(result) is False, result
+
+
+# =============================================================================
+# Researcher helpers — _sanitize_tool_json
+# =============================================================================
+
+from nodes.researcher import _sanitize_tool_json
+
+
+def test_sanitize_valid_json():
+    assert _sanitize_tool_json('{"symbol": "AAPL", "function": "OVERVIEW"}') == {
+        "symbol": "AAPL", "function": "OVERVIEW",
+    }
+
+
+def test_sanitize_single_quotes_and_trailing_comma():
+    assert _sanitize_tool_json("{'symbol': 'AAPL',}") == {"symbol": "AAPL"}
+
+
+def test_sanitize_bare_keys_with_equals():
+    assert _sanitize_tool_json('{symbol="TSLA", function="GLOBAL_QUOTE"}') == {
+        "symbol": "TSLA", "function": "GLOBAL_QUOTE",
+    }
+
+
+def test_sanitize_keeps_string_contents():
+    # Apostrophes and colons inside values must survive the rewrite
+    assert _sanitize_tool_json("{'topic': \"Macy's 10:30 a=b\"}") == {"topic": "Macy's 10:30 a=b"}
+
+
+def test_sanitize_keeps_plain_query_arg():
+    assert _sanitize_tool_json('{"query": "Apple Inc"}') == {"query": "Apple Inc"}
+
+
+def test_sanitize_unwraps_json_string_under_query():
+    assert _sanitize_tool_json('{"query": "{symbol=\'AAPL\'}"}') == {"symbol": "AAPL"}
+
+
+# =============================================================================
+# Researcher helpers — _fast_route
+# =============================================================================
+
+from nodes.researcher import _fast_route, _parse_call
+
+
+def test_fast_route_historical_prices():
+    line = _fast_route("historical price data for Apple (AAPL)")
+    assert _parse_call(line) == (
+        "get_stock_data", {"symbol": "AAPL", "function": "TIME_SERIES_DAILY"},
+    )
+
+
+def test_fast_route_income_statement_passes_limit():
+    line = _fast_route("- Income statement for Microsoft (NASDAQ: MSFT) (last 3 years)")
+    assert _parse_call(line)[1] == {"symbol": "MSFT", "function": "INCOME_STATEMENT", "limit": 3}
+
+
+def test_fast_route_limit_only_when_unit_matches():
+    line = _fast_route("daily closing prices for $AAPL over the last 10 trading days")
+    assert _parse_call(line)[1] == {"symbol": "AAPL", "function": "TIME_SERIES_DAILY", "limit": 10}
+    line = _fast_route("EPS for (NVDA) over the last 4 quarters")
+    assert _parse_call(line)[1] == {"symbol": "NVDA", "function": "EARNINGS", "limit": 4}
+    assert _fast_route("Stock price history of Apple (AAPL) over the last 5 years") is None
+    assert _fast_route("Cash flow for (MSFT) for the last 4 quarters") is None
+
+
+def test_fast_route_dollar_ticker():
+    line = _fast_route("Latest EPS and earnings in USD for $TSLA")
+    assert _parse_call(line)[1] == {"symbol": "TSLA", "function": "EARNINGS"}
+
+
+def test_fast_route_statements_win_over_historical():
+    line = _fast_route("Historical income statements for Apple (AAPL)")
+    assert _parse_call(line)[1] == {"symbol": "AAPL", "function": "INCOME_STATEMENT"}
+    line = _fast_route("historical earnings (EPS) for $MSFT")
+    assert _parse_call(line)[1] == {"symbol": "MSFT", "function": "EARNINGS"}
+
+
+def test_fast_route_requires_explicit_ticker():
+    assert _fast_route("historical price data for AAPL") is None
+    assert _fast_route("Income statement for Apple (FY 2023)") is None
+    assert _fast_route("Income statement for Apple (NYSE)") is None
+    assert _fast_route("daily prices for Apple (OHLC)") is None
+
+
+def test_fast_route_multiple_tickers_falls_back():
+    assert _fast_route("historical prices for (AAPL) and (MSFT)") is None
+
+
+def test_fast_route_no_match_falls_back():
+    assert _fast_route("background on the company's founders for (NVDA)") is None
+    assert _fast_route("historical price data for the company") is None
+
+
+def test_error_detection_only_scans_head():
+    body = "[Wikipedia: Foo]\n\n" + "x" * 600 + " page not found in archive"
+    assert _is_tool_result_an_error(body) is False
+
+
+# =============================================================================
+# Researcher helpers — _parse_call / _run_tool (raw tool functions)
+# =============================================================================
+
+from nodes.researcher import _run_tool
+from tools import TOOL_FUNCS
+
+
+def test_parse_call_coerces_quoted_limit():
+    _, args = _parse_call('CALL: get_stock_data | {"symbol": "AAPL", "limit": "5"}')
+    assert args["limit"] == 5
+
+
+def test_run_tool_calls_raw_function_and_drops_unknown_args():
+    result = _run_tool(
+        "get_graph_data",
+        {"graph_type": "BarGraph", "bogus": 1},
+        TOOL_FUNCS["get_graph_data"],
+    )
+    assert '"BarGraph"' in result
+
+
+def test_run_tool_reports_exceptions():
+    def boom(**_):
+        raise RuntimeError("kaboom")
+
+    assert _run_tool("get_graph_data", {}, boom) == "Tool error: kaboom"
+
+
+def test_run_tool_leaves_caching_to_tools():
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        return f"[Alpha Vantage: {symbol} Quote]"
+
+    args = {"symbol": "CACHETEST"}
+    _run_tool("get_stock_data", args, fetch)
+    _run_tool("get_stock_data", args, fetch)
+    assert calls == ["CACHETEST", "CACHETEST"]
+
+
+# =============================================================================
+# get_company_context — single generator=search round trip
+# =============================================================================
+
+import orjson
+import pytest
+
+import tools
+from cache import TTLCache
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.content = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        self.text = self.content.decode()
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def _fake_wiki(monkeypatch, payloads):
+    calls = []
+
+    def fake_get(url, params=None, headers=None, **_):
+        calls.append(params)
+        payload = payloads[len(calls) - 1]
+        return payload if isinstance(payload, _FakeResponse) else _FakeResponse(payload)
+
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", fake_get)
+    monkeypatch.setattr(tools, "_wiki_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_miss_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_wiki_etags", TTLCache(60))
+    return calls
+
+
+def test_company_context_uses_one_request(monkeypatch):
+    calls = _fake_wiki(monkeypatch, [
+        {"query": {"pages": {"856": {"title": "Apple Inc.", "extract": "Apple makes phones."}}}},
+    ])
+    result = tools.get_company_context.func("Apple")
+    assert result == "[Wikipedia: Apple Inc.]\n\nApple makes phones."
+    assert len(calls) == 1
+    assert calls[0]["generator"] == "search"
+
+
+def test_company_context_falls_back_to_search_then_extract(monkeypatch):
+    calls = _fake_wiki(monkeypatch, [
+        {"batchcomplete": ""},
+        {"query": {"search": [{"title": "Apple Inc."}]}},
+        {"query": {"pages": {"856": {"title": "Apple Inc.", "extract": "Apple makes phones."}}}},
+    ])
+    result = tools.get_company_context.func("Apple")
+    assert result == "[Wikipedia: Apple Inc.]\n\nApple makes phones."
+    assert len(calls) == 3
+
+
+def test_company_context_no_article(monkeypatch):
+    _fake_wiki(monkeypatch, [{"batchcomplete": ""}, {"query": {"search": []}}])
+    result = tools.get_company_context.func("XYZNOTREAL")
+    assert result == "No Wikipedia article found for 'XYZNOTREAL'."
+
+
+# =============================================================================
+# Tool response caches
+# =============================================================================
+
+def test_company_context_is_cached(monkeypatch):
+    calls = _fake_wiki(monkeypatch, [
+        {"query": {"pages": {"856": {"title": "Apple Inc.", "extract": "Apple makes phones."}}}},
+    ])
+    first = tools.get_company_context.func("Apple")
+    assert tools.get_company_context.func("  apple ") == first
+    assert len(calls) == 1
+
+
+def test_company_context_caches_misses(monkeypatch):
+    calls = _fake_wiki(monkeypatch, [{"batchcomplete": ""}, {"query": {"search": []}}])
+    tools.get_company_context.func("XYZNOTREAL")
+    tools.get_company_context.func("XYZNOTREAL")
+    assert len(calls) == 2   # combined call + fallback search, once
+
+
+def test_company_context_revalidates_with_etag(monkeypatch):
+    page = {"query": {"pages": {"856": {"title": "Apple Inc.", "extract": "Apple makes phones."}}}}
+    sent = []
+    calls = _fake_wiki(monkeypatch, [
+        _FakeResponse(page, headers={"ETag": '"v1"'}),
+        _FakeResponse(b"", status_code=304),
+    ])
+    real_get = tools.HTTP_SESSION.get
+    monkeypatch.setattr(
+        tools.HTTP_SESSION, "get",
+        lambda url, headers=None, **kw: sent.append(headers) or real_get(url, **kw),
+    )
+    first = tools.get_company_context.func("Apple")
+    monkeypatch.setattr(tools, "_wiki_cache", TTLCache(60))   # fresh entry expired
+    assert tools.get_company_context.func("Apple") == first
+    assert len(calls) == 2
+    assert sent == [None, {"If-None-Match": '"v1"'}]
+
+
+def test_stock_data_does_not_cache_errors(monkeypatch):
+    calls = []
+
+    def fetch(symbol, function, limit):
+        calls.append(symbol)
+        return "Alpha Vantage rate limit reached. Try again in a minute."
+
+    monkeypatch.setattr(tools, "_fetch_stock_data", fetch)
+    monkeypatch.setattr(tools, "_quote_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_miss_cache", TTLCache(60))
+    tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    assert len(calls) == 2
+
+
+# =============================================================================
+# get_stock_data — payload parsing
+# =============================================================================
+
+def _fake_alpha_vantage(monkeypatch, payload):
+    monkeypatch.setenv("ALPHAVANTAGE_API_KEY", "test-key")
+    monkeypatch.setattr(tools, "_av_circuit", {"failures": 0, "open_until": 0.0})
+    monkeypatch.setattr(tools, "_av_bucket", tools._TokenBucket(1000, capacity=1000))
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", lambda *a, **k: _FakeResponse(payload))
+    monkeypatch.setattr(tools, "_quote_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_fundamentals_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_miss_cache", TTLCache(60))
+
+
+def test_stock_data_daily_takes_newest_days(monkeypatch):
+    bar = {"1. open": "1", "2. high": "2", "3. low": "0.5", "4. close": "1.5", "5. volume": "9"}
+    series = {f"2024-01-{d:02d}": bar for d in (3, 9, 1, 5, 7)}
+    _fake_alpha_vantage(monkeypatch, {"Time Series (Daily)": series})
+    lines = tools.get_stock_data.func("aapl", "TIME_SERIES_DAILY", limit=3).splitlines()
+    assert lines[0] == "[Alpha Vantage: AAPL Daily Prices (last 3 days)]"
+    assert [line[:10] for line in lines[1:]] == ["2024-01-09", "2024-01-07", "2024-01-05"]
+
+
+def test_stock_data_daily_reads_csv(monkeypatch):
+    csv_body = (
+        b"timestamp,open,high,low,close,volume\r\n"
+        b"2024-01-09,1,2,0.5,1.5,9\r\n"
+        b"2024-01-08,1,2,0.5,1.4,8\r\n"
+        b"2024-01-05,1,2,0.5,1.3,7\r\n"
+    )
+    _fake_alpha_vantage(monkeypatch, csv_body)
+    lines = tools.get_stock_data.func("aapl", "TIME_SERIES_DAILY", limit=2).splitlines()
+    assert lines == [
+        "[Alpha Vantage: AAPL Daily Prices (last 2 days)]",
+        "2024-01-09: open=1 high=2 low=0.5 close=1.5 vol=9",
+        "2024-01-08: open=1 high=2 low=0.5 close=1.4 vol=8",
+    ]
+
+
+def test_stock_data_daily_csv_request_surfaces_json_notice(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {"Information": "25 requests per day"})
+    result = tools.get_stock_data.func("AAPL", "TIME_SERIES_DAILY")
+    assert result == "Alpha Vantage API notice: 25 requests per day"
+
+
+def test_stock_data_empty_payload_is_a_short_lived_miss(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {})
+    result = tools.get_stock_data.func("ZZZZ", "OVERVIEW")
+    assert result == "No data found for 'ZZZZ' (OVERVIEW)."
+    key = ("OVERVIEW", "ZZZZ", None)
+    assert tools._fundamentals_cache.get(key) is None
+    assert tools._miss_cache.get(key) == result
+    assert _is_tool_result_an_error(result)
+
+
+def test_stock_data_income_statement_table(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {"annualReports": [
+        {"fiscalDateEnding": "2023-09-30", "totalRevenue": "383", "netIncome": "97"},
+    ]})
+    result = tools.get_stock_data.func("AAPL", "INCOME_STATEMENT")
+    assert result == (
+        "[Alpha Vantage: AAPL INCOME STATEMENT (Annual)]\n"
+        "\nFiscalYear: 2023-09-30\n"
+        "  Revenue: 383\n"
+        "  Gross Profit: N/A\n"
+        "  Net Income: 97\n"
+        "  Operating Income: N/A\n"
+        "  EBITDA: N/A"
+    )
+
+
+def test_stock_data_retries_after_rate_limit_note(monkeypatch):
+    replies = [{"Note": "5 calls per minute"}, {"Global Quote": {"05. price": "195.42"}}]
+    sleeps = []
+    _fake_alpha_vantage(monkeypatch, None)
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", lambda *a, **k: _FakeResponse(replies.pop(0)))
+    monkeypatch.setattr(tools.time, "sleep", sleeps.append)
+    result = tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    assert "Price: 195.42" in result
+    assert len(sleeps) == 1
+
+
+def test_stock_data_gives_up_after_retries(monkeypatch):
+    sleeps = []
+    _fake_alpha_vantage(monkeypatch, {"Note": "5 calls per minute"})
+    monkeypatch.setattr(tools.time, "sleep", sleeps.append)
+    result = tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    assert result.startswith("Alpha Vantage rate limit reached.")
+    assert len(sleeps) == tools.AV_RATE_LIMIT_RETRIES
+
+
+def test_stock_data_without_api_key(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {"Global Quote": {"05. price": "1"}})
+    monkeypatch.delenv("ALPHAVANTAGE_API_KEY")
+    result = tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    assert result == (
+        "Unexpected error fetching stock data for 'AAPL': ALPHAVANTAGE_API_KEY is not set"
+    )
+
+
+def test_stock_data_rejects_invalid_ticker_without_request(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {})
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", lambda *a, **k: pytest.fail("network call"))
+    for symbol in ("", "   ", "apple inc", "AAPL;DROP", "X" * 11):
+        assert tools.get_stock_data.func(symbol) == f"Invalid ticker symbol '{symbol}'."
+
+
+def test_stock_data_circuit_opens_after_repeated_throttling(monkeypatch):
+    calls = []
+    _fake_alpha_vantage(monkeypatch, None)
+    monkeypatch.setattr(
+        tools.HTTP_SESSION, "get",
+        lambda *a, **k: calls.append(1) or _FakeResponse({"Information": "25 requests per day"}),
+    )
+    for symbol in ("AAPL", "MSFT"):
+        assert tools.get_stock_data.func(symbol).startswith("Alpha Vantage API notice")
+    result = tools.get_stock_data.func("GOOG")
+    assert result.startswith("Alpha Vantage rate limit reached.")
+    assert len(calls) == 2
+
+
+def test_stock_data_success_resets_circuit(monkeypatch):
+    replies = [{"Information": "slow down"}, {"Global Quote": {"05. price": "1"}},
+               {"Information": "slow down"}, {"Global Quote": {"05. price": "2"}}]
+    _fake_alpha_vantage(monkeypatch, None)
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", lambda *a, **k: _FakeResponse(replies.pop(0)))
+    for symbol in ("A", "B", "C", "D"):
+        tools.get_stock_data.func(symbol, "GLOBAL_QUOTE")
+    assert replies == []
+    assert tools._av_circuit["open_until"] == 0.0
+
+
+def test_circuit_counts_concurrent_throttled_replies(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(tools, "_av_circuit", {"failures": 0, "open_until": 0.0})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: tools._record_av_reply(throttled=True), range(400)))
+    assert tools._av_circuit["failures"] == 400
+
+
+def test_stock_data_unknown_function_dumps_raw_json(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {"symbol": "AAPL", "value": 1})
+    result = tools.get_stock_data.func("AAPL", "SOMETHING_ELSE")
+    assert result.startswith("[Alpha Vantage: AAPL / SOMETHING_ELSE]\n{\n")
+    assert '"value": 1' in result
+
+
+# =============================================================================
+# get_stock_data_batch — fan-out over get_stock_data
+# =============================================================================
+
+def test_stock_data_batch_dedupes_and_keeps_order(monkeypatch):
+    seen = []
+
+    def fetch(symbol, function, limit):
+        seen.append(symbol)
+        return f"[Alpha Vantage: {symbol} Quote]"
+
+    monkeypatch.setattr(tools, "_fetch_stock_data", fetch)
+    monkeypatch.setattr(tools, "_quote_cache", TTLCache(60))
+    monkeypatch.setattr(tools, "_miss_cache", TTLCache(60))
+    result = tools.get_stock_data_batch.func(["msft", "AAPL", "MSFT "], "GLOBAL_QUOTE")
+    assert result == tools.BATCH_SEPARATOR.join(
+        ["[Alpha Vantage: MSFT Quote]", "[Alpha Vantage: AAPL Quote]"]
+    )
+    assert sorted(seen) == ["AAPL", "MSFT"]
+
+
+def test_stock_data_batch_without_symbols():
+    assert tools.get_stock_data_batch.func(" , ") == "No symbols given for batch stock lookup."
+
+
+# =============================================================================
+# Batch results in the researcher — each symbol judged on its own
+# =============================================================================
+
+_GOOD = "[Alpha Vantage: MSFT Quote]\nPrice: 1"
+_BAD  = "Invalid ticker symbol 'apple inc'."
+
+
+def test_batch_with_failed_first_symbol_is_usable():
+    assert _is_tool_result_an_error(tools.BATCH_SEPARATOR.join([_BAD, _GOOD])) is False
+
+
+def test_batch_with_every_symbol_failed_is_an_error():
+    assert _is_tool_result_an_error(tools.BATCH_SEPARATOR.join([_BAD, _BAD])) is True
+
+
+def test_run_tool_does_not_cache_partly_failed_batch():
+    calls = []
+
+    def fetch(symbols):
+        calls.append(symbols)
+        return tools.BATCH_SEPARATOR.join([_GOOD, "x" * 600, _BAD])
+
+    args = {"symbols": ["MSFT", "AAPL", "apple inc"]}
+    _run_tool("get_stock_data_batch", args, fetch)
+    _run_tool("get_stock_data_batch", args, fetch)
+    assert len(calls) == 2
+
+
+# =============================================================================
+# Alpha Vantage request pacing
+# =============================================================================
+
+def test_token_bucket_fails_fast_when_wait_is_too_long():
+    bucket = tools._TokenBucket(rate=1 / 60, capacity=2)
+    assert bucket.acquire(max_wait=0) is True
+    assert bucket.acquire(max_wait=0) is True
+    assert bucket.acquire(max_wait=2) is False
+
+
+def test_stock_data_reports_pacing_without_request(monkeypatch):
+    _fake_alpha_vantage(monkeypatch, {})
+    monkeypatch.setattr(tools, "_av_bucket", tools._TokenBucket(rate=1 / 60, capacity=0))
+    monkeypatch.setattr(tools.HTTP_SESSION, "get", lambda *a, **k: pytest.fail("network call"))
+    result = tools.get_stock_data.func("AAPL", "GLOBAL_QUOTE")
+    assert result.startswith("Alpha Vantage rate limit reached for 'AAPL'.")
+    assert _is_tool_result_an_error(result) is True
+
+
+# =============================================================================
+# researcher_node — a failed fast route falls back to the planner
+# =============================================================================
+
+import time
+
+from nodes import researcher
+from nodes.planner_cache import PlannerCache
+
+
+def test_failed_fast_route_hands_over_to_planner(monkeypatch):
+    planner_calls = []
+
+    def fake_llm_call(state, fn, messages, **_):
+        planner_calls.append(messages[-1].content)
+        return "DONE"
+
+    monkeypatch.setattr(researcher, "RESEARCHER_SINGLE_SHOT", True)
+    monkeypatch.setattr(researcher, "llm_call", fake_llm_call)
+    monkeypatch.setattr(researcher, "_planner_cache", PlannerCache(embed=None))
+    monkeypatch.setattr(researcher, "TOOL_FUNCS", {
+        "get_stock_data": lambda **_: "No income statement data found for 'FOO'.",
+    })
+    out = researcher.researcher_node({
+        "messages": [], "user_msg": "Foo Corp income statement",
+        "data_needed": "Income statement for Foo Corp (FOO)", "start_time": time.monotonic(),
+    })
+    assert len(planner_calls) == 1
+    assert "No income statement data found" in planner_calls[0]
+    assert out["data_fetched"] is False
+
+
+def test_planner_context_keeps_result_header(monkeypatch):
+    planner_calls = []
+
+    def fake_llm_call(state, fn, messages, **_):
+        planner_calls.append(messages[-1].content)
+        return "DONE"
+
+    monkeypatch.setattr(researcher, "RESEARCHER_SINGLE_SHOT", False)
+    monkeypatch.setattr(researcher, "llm_call", fake_llm_call)
+    monkeypatch.setattr(researcher, "_planner_cache", PlannerCache(embed=None))
+    monkeypatch.setattr(researcher, "TOOL_FUNCS", {
+        "get_stock_data": lambda **_: "[Alpha Vantage: FOO Daily Prices]\n2024-01-09: newest\n"
+        + "2024-01-01: older\n" * 100,
+    })
+    researcher.researcher_node({
+        "messages": [], "user_msg": "Foo Corp prices",
+        "data_needed": "Daily prices for Foo Corp (FOO)", "start_time": time.monotonic(),
+    })
+    have = planner_calls[0].split("Have: ", 1)[1]
+    assert have.startswith("[Alpha Vantage: FOO Daily Prices]\n2024-01-09: newest")
@@ -0,0 +1,25 @@
+"""
+Tests for nodes/validator.py — verdict parsing helpers (no LLM calls).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodes.validator import _strip_fences
+
+
+def test_strip_fences_json_tag():
+    assert _strip_fences('```json\n{"result": "pass"}\n```') == '{"result": "pass"}'
+
+
+def test_strip_fences_bare_fence():
+    assert _strip_fences('```\n{"result": "fail"}\n```') == '{"result": "fail"}'
+
+
+def test_strip_fences_inline_and_unclosed():
+    assert _strip_fences('```{"result": "pass"}```') == '{"result": "pass"}'
+    assert _strip_fences('```json\n{"result": "pass"}') == '{"result": "pass"}'
+
+
+def test_strip_fences_no_fence():
+    assert _strip_fences('  {"result": "pass"}\n') == '{"result": "pass"}'
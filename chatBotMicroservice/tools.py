@@ -1,15 +1,108 @@
+import csv
+import heapq
+import io
+import itertools
 import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import orjson
 import requests
-import json
 from dotenv import load_dotenv
 from langchain_core.tools import tool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import TTLCache
+
+__all__ = [
+    "get_graph_data",
+    "get_company_context",
+    "get_stock_data",
+    "get_stock_data_batch",
+    "TOOLS",
+    "TOOL_MAP",
+    "TOOL_FUNCS",
+    "TOOL_PARAMS",
+    "TOOL_LIST",
+    "USER_DISPLAY_TOOLS",
+    "CONTEXT_TOOLS",
+    "GRAPH_SCHEMAS",
+    "HTTP_SESSION",
+    "BATCH_SEPARATOR",
+]
 
 load_dotenv()
-ALPHAVANTAGE_API_KEY = os.environ["ALPHAVANTAGE_API_KEY"]
 ALPHAVANTAGE_BASE_URL = "https://www.alphavantage.co/query"
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
 
 USER_DISPLAY_TOOLS = {"get_graph_data"}
-CONTEXT_TOOLS = {"get_company_context", "get_stock_data"}
+CONTEXT_TOOLS = {"get_company_context", "get_stock_data", "get_stock_data_batch"}
+
+# Shape check for tickers before any Alpha Vantage call (BRK.B, RDS-A, 7203)
+_TICKER_RE = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
+# =============================================================================
+# HTTP SESSION
+#
+# One pooled session for every tool call, so Alpha Vantage and Wikipedia
+# requests reuse kept-alive TCP/TLS connections instead of handshaking each
+# time. The pool is sized for the researcher's parallel tool calls; transient
+# 429/5xx responses are retried on the pooled connection with a short backoff.
+# =============================================================================
+
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({"User-Agent": "CompanyContextBot/1.0"})
+HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+# =============================================================================
+# RESPONSE CACHES
+#
+# Formatted tool results, kept per data source for as long as that data stays
+# meaningful: quotes and daily prices for a minute, fundamentals and Wikipedia
+# intros for a day. "No data found" answers are kept for a few minutes so a
+# repeated miss does not spend Alpha Vantage's daily quota. Network errors and
+# rate-limit notices are never cached.
+# =============================================================================
+
+WIKI_CACHE_TTL_SECS         = 86400
+QUOTE_CACHE_TTL_SECS        = 60
+FUNDAMENTALS_CACHE_TTL_SECS = 86400
+MISS_CACHE_TTL_SECS         = 300
+WIKI_ETAG_TTL_SECS          = 7 * 86400   # expired intros kept this long for If-None-Match
+
+_QUOTE_FUNCTIONS = frozenset({"GLOBAL_QUOTE", "TIME_SERIES_DAILY"})
+_MISS_PREFIXES   = ("No ", "Wikipedia article '")   # empty-result messages from both tools
+
+_wiki_cache         = TTLCache(WIKI_CACHE_TTL_SECS, max_entries=512)
+_quote_cache        = TTLCache(QUOTE_CACHE_TTL_SECS, max_entries=1024)
+_fundamentals_cache = TTLCache(FUNDAMENTALS_CACHE_TTL_SECS, max_entries=1024)
+_miss_cache         = TTLCache(MISS_CACHE_TTL_SECS, max_entries=1024)
+_wiki_etags         = TTLCache(WIKI_ETAG_TTL_SECS, max_entries=512)   # key → (etag, result)
+
+
+def _cached(cache: TTLCache, key: tuple, fetch) -> str:
+    """Return the cached result for key, or call fetch() and cache what it returns."""
+    result = cache.get(key)
+    if result is None:
+        result = _miss_cache.get(key)
+    if result is not None:
+        return result
+    result = fetch()
+    if result.startswith("["):
+        cache.set(key, result)
+    elif result.startswith(_MISS_PREFIXES):
+        _miss_cache.set(key, result)
+    return result
+
 
 # =============================================================================
 # GRAPH SCHEMAS
@@ -87,6 +180,11 @@ GRAPH_SCHEMAS = {
     },
 }
 
+# Built once — get_graph_data only copies one of these tuples into a list
+_ALL_SCHEMAS     = tuple(GRAPH_SCHEMAS.values())
+_SCHEMAS_BY_TYPE = {name: (schema,) for name, schema in GRAPH_SCHEMAS.items()}
+
+
 @tool
 def get_graph_data(graph_type: str = "all") -> list:
     """Returns a JSON template the LLM must fill with real data for chart rendering.
@@ -102,10 +200,7 @@ def get_graph_data(graph_type: str = "all") -> list:
     Args:
         graph_type: 'LineGraph', 'BarGraph', 'ScatterPlot', or 'all'.
     """
-    if graph_type == "all":
-        return list(GRAPH_SCHEMAS.values())
-    schema = GRAPH_SCHEMAS.get(graph_type)
-    return [schema] if schema else list(GRAPH_SCHEMAS.values())
+    return list(_SCHEMAS_BY_TYPE.get(graph_type, _ALL_SCHEMAS))
 
 
 @tool
@@ -115,33 +210,60 @@ def get_company_context(query: str) -> str:
     Args:
         query: The topic to look up (e.g. 'Apple Inc', 'Elon Musk').
     """
+    key = ("wiki", " ".join(query.lower().split()))
+    return _cached(_wiki_cache, key, lambda: _fetch_company_context(query, key))
+
+
+def _fetch_company_context(query: str, key: tuple) -> str:
     try:
-        search_resp = requests.get(
-            "https://en.wikipedia.org/w/api.php",
-            params={"action": "query", "list": "search", "srsearch": query,
-                    "srlimit": 1, "format": "json"},
+        # Revalidate an expired result: a 304 reuses it without resending the extract
+        stale = _wiki_etags.get(key)
+        # One round trip: generator=search feeds the top hit straight into prop=extracts
+        combined_resp = HTTP_SESSION.get(
+            WIKIPEDIA_API_URL,
+            params={"action": "query", "generator": "search", "gsrsearch": query,
+                    "gsrlimit": 1, "prop": "extracts", "exintro": True,
+                    "explaintext": True, "format": "json", "redirects": "1"},
             timeout=10,
-            headers={"User-Agent": "CompanyContextBot/1.0"},
+            headers={"If-None-Match": stale[0]} if stale else None,
         )
-        results = search_resp.json().get("query", {}).get("search", [])
-        if not results:
-            return f"No Wikipedia article found for '{query}'."
-        title = results[0]["title"]
-        extract_resp = requests.get(
-            "https://en.wikipedia.org/w/api.php",
-            params={"action": "query", "prop": "extracts", "exintro": True,
-                    "explaintext": True, "titles": title, "format": "json", "redirects": "1"},
-            timeout=10,
-            headers={"User-Agent": "CompanyContextBot/1.0"},
-        )
-        pages = extract_resp.json().get("query", {}).get("pages", {})
-        if not pages or "-1" in pages:
-            return f"Wikipedia article '{title}' not found or empty."
-        extract = next(iter(pages.values())).get("extract", "").strip()
+        if stale and combined_resp.status_code == 304:
+            return stale[1]
+        etag = combined_resp.headers.get("ETag")
+        pages = orjson.loads(combined_resp.content).get("query", {}).get("pages", {})
+        if pages:
+            page = next(iter(pages.values()))
+            title = page.get("title", query)
+        else:
+            # Fallback: the older search → extract pair, on the same pooled connection
+            search_resp = HTTP_SESSION.get(
+                WIKIPEDIA_API_URL,
+                params={"action": "query", "list": "search", "srsearch": query,
+                        "srlimit": 1, "format": "json"},
+                timeout=10,
+            )
+            results = orjson.loads(search_resp.content).get("query", {}).get("search", [])
+            if not results:
+                return f"No Wikipedia article found for '{query}'."
+            title = results[0]["title"]
+            extract_resp = HTTP_SESSION.get(
+                WIKIPEDIA_API_URL,
+                params={"action": "query", "prop": "extracts", "exintro": True,
+                        "explaintext": True, "titles": title, "format": "json", "redirects": "1"},
+                timeout=10,
+            )
+            pages = orjson.loads(extract_resp.content).get("query", {}).get("pages", {})
+            if not pages or "-1" in pages:
+                return f"Wikipedia article '{title}' not found or empty."
+            page = next(iter(pages.values()))
+        extract = page.get("extract", "").strip()
         if not extract:
             return f"No content found for '{title}'."
         trimmed = extract[:2000] + ("..." if len(extract) > 2000 else "")
-        return f"[Wikipedia: {title}]\n\n{trimmed}"
+        result = f"[Wikipedia: {title}]\n\n{trimmed}"
+        if etag:
+            _wiki_etags.set(key, (etag, result))
+        return result
     except Exception as e:
         return f"Error retrieving context: {str(e)}"
 
@@ -155,20 +277,170 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
         function: The type of data to retrieve.
         limit: Optional. Limits the number of items returned (e.g., days, reports, earnings). Defaults depend on function.
     """
+    cache = _quote_cache if function in _QUOTE_FUNCTIONS else _fundamentals_cache
+    sym = symbol.upper().strip()
+    # A malformed ticker would only come back as an Alpha Vantage error — don't spend quota on it
+    if not _TICKER_RE.match(sym):
+        return f"Invalid ticker symbol '{symbol}'."
+    return _cached(cache, (function, sym, limit), lambda: _fetch_stock_data(sym, function, limit))
+
+
+AV_RATE_LIMIT_RETRIES = 2   # extra attempts after a "Note" rate-limit reply
+
+# OVERVIEW fields listed before the (truncated) Description
+_OVERVIEW_KEYS = (
+    "Name", "Symbol", "Exchange", "Sector", "Industry",
+    "MarketCapitalization", "PERatio", "EPS", "DividendYield",
+    "52WeekHigh", "52WeekLow", "AnalystTargetPrice",
+    "RevenuePerShareTTM", "ProfitMargin", "OperatingMarginTTM",
+    "ReturnOnEquityTTM", "RevenueTTM", "GrossProfitTTM",
+)
+
+# Block printed for each fiscal year of a statement, filled from one annualReports entry
+_REPORT_TEMPLATES = {
+    "INCOME_STATEMENT": (
+        "\nFiscalYear: {fiscalDateEnding}\n"
+        "  Revenue: {totalRevenue}\n"
+        "  Gross Profit: {grossProfit}\n"
+        "  Net Income: {netIncome}\n"
+        "  Operating Income: {operatingIncome}\n"
+        "  EBITDA: {ebitda}"
+    ),
+    "BALANCE_SHEET": (
+        "\nFiscalYear: {fiscalDateEnding}\n"
+        "  Total Assets: {totalAssets}\n"
+        "  Total Liabilities: {totalLiabilities}\n"
+        "  Shareholder Equity: {totalShareholderEquity}\n"
+        "  Cash & Equivalents: {cashAndCashEquivalentsAtCarryingValue}\n"
+        "  Long Term Debt: {longTermDebt}"
+    ),
+    "CASH_FLOW": (
+        "\nFiscalYear: {fiscalDateEnding}\n"
+        "  Operating Cash Flow: {operatingCashflow}\n"
+        "  Capital Expenditures: {capitalExpenditures}\n"
+        "  Free Cash Flow: {freeCashFlow}\n"
+        "  Dividend Payout: {dividendPayout}"
+    ),
+}
+
+
+class _ReportFields(dict):
+    """annualReports entry for str.format_map — absent fields render as N/A."""
+
+    def __missing__(self, key: str) -> str:
+        return "N/A"
+
+
+def _format_daily_csv(symbol: str, text: str, limit: int | None) -> str:
+    # Rows are timestamp,open,high,low,close,volume — newest first after the header
+    rows = csv.reader(io.StringIO(text))
+    next(rows, None)
+    days = list(itertools.islice(rows, limit or 30))
+    if not days:
+        return f"No daily price data found for '{symbol}'."
+    lines = [f"[Alpha Vantage: {symbol} Daily Prices (last {len(days)} days)]"]
+    for day, open_, high, low, close, volume, *_ in days:
+        lines.append(f"{day}: open={open_} high={high} low={low} close={close} vol={volume}")
+    return "\n".join(lines)
+
+
+def _alphavantage_key() -> str:
+    # Read per call, so a missing key fails the tool instead of the import and
+    # a rotated key is picked up without a restart
+    key = os.environ.get("ALPHAVANTAGE_API_KEY")
+    if not key:
+        raise RuntimeError("ALPHAVANTAGE_API_KEY is not set")
+    return key
+
+
+# Circuit breaker: after AV_CIRCUIT_THRESHOLD throttled replies in a row, calls
+# fail fast for AV_CIRCUIT_OPEN_SECS instead of queueing up behind the limit
+AV_CIRCUIT_THRESHOLD = 2
+AV_CIRCUIT_OPEN_SECS = 60
+_av_circuit = {"failures": 0, "open_until": 0.0}   # open_until is time.monotonic()
+_av_circuit_lock = threading.Lock()   # updated from the tool and batch pools
+
+
+def _record_av_reply(throttled: bool) -> None:
+    with _av_circuit_lock:
+        if not throttled:
+            _av_circuit["failures"] = 0
+            return
+        _av_circuit["failures"] += 1
+        if _av_circuit["failures"] >= AV_CIRCUIT_THRESHOLD:
+            _av_circuit["open_until"] = time.monotonic() + AV_CIRCUIT_OPEN_SECS
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to capacity banked."""
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take one token, sleeping up to max_wait for it. False if that is not enough."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            wait = (1 - self._tokens) / self._rate if self._tokens < 1 else 0.0
+            if wait > max_wait:
+                return False
+            self._tokens -= 1   # reserve now; the sleep below happens outside the lock
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+# Client-side pacing of every Alpha Vantage request (single, batch and retries)
+# to the key's per-minute allowance; a request that would wait longer than
+# AV_PACE_MAX_WAIT_SECS fails fast instead of holding up the researcher
+AV_REQUESTS_PER_MIN   = int(os.getenv("ALPHAVANTAGE_REQUESTS_PER_MIN", "5"))
+AV_PACE_MAX_WAIT_SECS = 2.0
+_av_bucket = _TokenBucket(AV_REQUESTS_PER_MIN / 60, capacity=AV_REQUESTS_PER_MIN)
+
+
+def _fetch_stock_data(symbol: str, function: str, limit: int | None) -> str:
+    # symbol arrives upper-cased and validated by get_stock_data
+    if time.monotonic() < _av_circuit["open_until"]:
+        return "Alpha Vantage rate limit reached. Requests are paused — try again shortly."
     try:
         params = {
             "function": function,
-            "symbol": symbol.upper().strip(),
-            "apikey": ALPHAVANTAGE_API_KEY,
+            "symbol": symbol,
+            "apikey": _alphavantage_key(),
         }
 
-        # Default output size
+        # Default output size; CSV drops the per-bar JSON keys ("1. open", …)
         if function == "TIME_SERIES_DAILY":
             params["outputsize"] = "compact"
+            params["datatype"] = "csv"
+
+        # The per-minute limit answers 200 + "Note"; back off briefly and retry
+        for attempt in range(AV_RATE_LIMIT_RETRIES + 1):
+            if not _av_bucket.acquire(AV_PACE_MAX_WAIT_SECS):
+                return (
+                    f"Alpha Vantage rate limit reached for '{symbol}'. "
+                    f"Requests are paced to {AV_REQUESTS_PER_MIN}/min — try again shortly."
+                )
+            resp = HTTP_SESSION.get(ALPHAVANTAGE_BASE_URL, params=params, timeout=15)
+            resp.raise_for_status()
+
+            # Errors and rate-limit notices still arrive as JSON on a CSV request
+            if params.get("datatype") == "csv" and not resp.content.lstrip().startswith(b"{"):
+                _record_av_reply(throttled=False)
+                return _format_daily_csv(symbol, resp.text, limit)
+
+            data = orjson.loads(resp.content)
+            if "Note" not in data or attempt == AV_RATE_LIMIT_RETRIES:
+                break
+            time.sleep(min(12, 2 ** attempt) + random.random())
 
-        resp = requests.get(ALPHAVANTAGE_BASE_URL, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        _record_av_reply(throttled="Note" in data or "Information" in data)
 
         # Alpha Vantage errors / rate limits
         if "Error Message" in data:
@@ -177,23 +449,17 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
             return f"Alpha Vantage rate limit reached. Try again in a minute. ({data['Note']})"
         if "Information" in data:
             return f"Alpha Vantage API notice: {data['Information']}"
+        # Unknown symbols come back as a bare {} — a miss, not a result to keep for a day
+        if not data:
+            return f"No data found for '{symbol}' ({function})."
 
         # OVerview
         if function == "OVERVIEW":
-            keys = [
-                "Name", "Symbol", "Exchange", "Sector", "Industry",
-                "MarketCapitalization", "PERatio", "EPS", "DividendYield",
-                "52WeekHigh", "52WeekLow", "AnalystTargetPrice",
-                "RevenuePerShareTTM", "ProfitMargin", "OperatingMarginTTM",
-                "ReturnOnEquityTTM", "RevenueTTM", "GrossProfitTTM", "Description",
-            ]
-            summary = {k: data.get(k, "N/A") for k in keys}
-            lines = [f"[Alpha Vantage: {symbol.upper()} Overview]"]
-            for k, v in summary.items():
-                if k == "Description":
-                    lines.append(f"\nDescription: {v[:400]}{'...' if len(str(v)) > 400 else ''}")
-                else:
-                    lines.append(f"{k}: {v}")
+            get = data.get
+            lines = [f"[Alpha Vantage: {symbol} Overview]"]
+            lines.extend(f"{k}: {get(k, 'N/A')}" for k in _OVERVIEW_KEYS)
+            desc = str(get("Description", "N/A"))
+            lines.append(f"\nDescription: {desc[:400]}{'...' if len(desc) > 400 else ''}")
             return "\n".join(lines)
 
         # GLOBAL_QUOTE
@@ -202,7 +468,7 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
             if not q:
                 return f"No quote data found for '{symbol}'."
             return (
-                f"[Alpha Vantage: {symbol.upper()} Quote]\n"
+                f"[Alpha Vantage: {symbol} Quote]\n"
                 f"Price: {q.get('05. price', 'N/A')}\n"
                 f"Change: {q.get('09. change', 'N/A')} ({q.get('10. change percent', 'N/A')})\n"
                 f"Open: {q.get('02. open', 'N/A')}\n"
@@ -218,8 +484,9 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
             series = data.get("Time Series (Daily)", {})
             if not series:
                 return f"No daily price data found for '{symbol}'."
-            days = sorted(series.keys(), reverse=True)[:limit or 30]
-            lines = [f"[Alpha Vantage: {symbol.upper()} Daily Prices (last {len(days)} days)]"]
+            # ISO dates sort lexicographically — take the newest N without a full sort
+            days = heapq.nlargest(limit or 30, series)
+            lines = [f"[Alpha Vantage: {symbol} Daily Prices (last {len(days)} days)]"]
             for day in days:
                 d = series[day]
                 lines.append(
@@ -229,52 +496,21 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
             return "\n".join(lines)
 
         # INCOME_STATEMENT, BALANCE_SHEET, CASH_FLOW
-        report_functions = ["INCOME_STATEMENT", "BALANCE_SHEET", "CASH_FLOW"]
-        if function in report_functions:
-            report_key_map = {
-                "INCOME_STATEMENT": "annualReports",
-                "BALANCE_SHEET": "annualReports",
-                "CASH_FLOW": "annualReports",
-            }
-            reports = data.get(report_key_map[function], [])
+        report_template = _REPORT_TEMPLATES.get(function)
+        if report_template:
+            reports = data.get("annualReports", [])
+            title = function.replace("_", " ")
             if not reports:
-                return f"No {function.replace('_',' ').lower()} data found for '{symbol}'."
-            lines = [f"[Alpha Vantage: {symbol.upper()} {function.replace('_',' ')} (Annual)]"]
-            for r in reports[:limit or 3]:
-                fiscal = r.get("fiscalDateEnding", "N/A")
-                if function == "INCOME_STATEMENT":
-                    lines.append(
-                        f"\nFiscalYear: {fiscal}\n"
-                        f"  Revenue: {r.get('totalRevenue', 'N/A')}\n"
-                        f"  Gross Profit: {r.get('grossProfit', 'N/A')}\n"
-                        f"  Net Income: {r.get('netIncome', 'N/A')}\n"
-                        f"  Operating Income: {r.get('operatingIncome', 'N/A')}\n"
-                        f"  EBITDA: {r.get('ebitda', 'N/A')}"
-                    )
-                elif function == "BALANCE_SHEET":
-                    lines.append(
-                        f"\nFiscalYear: {fiscal}\n"
-                        f"  Total Assets: {r.get('totalAssets', 'N/A')}\n"
-                        f"  Total Liabilities: {r.get('totalLiabilities', 'N/A')}\n"
-                        f"  Shareholder Equity: {r.get('totalShareholderEquity', 'N/A')}\n"
-                        f"  Cash & Equivalents: {r.get('cashAndCashEquivalentsAtCarryingValue', 'N/A')}\n"
-                        f"  Long Term Debt: {r.get('longTermDebt', 'N/A')}"
-                    )
-                elif function == "CASH_FLOW":
-                    lines.append(
-                        f"\nFiscalYear: {fiscal}\n"
-                        f"  Operating Cash Flow: {r.get('operatingCashflow', 'N/A')}\n"
-                        f"  Capital Expenditures: {r.get('capitalExpenditures', 'N/A')}\n"
-                        f"  Free Cash Flow: {r.get('freeCashFlow', 'N/A')}\n"
-                        f"  Dividend Payout: {r.get('dividendPayout', 'N/A')}"
-                    )
+                return f"No {title.lower()} data found for '{symbol}'."
+            lines = [f"[Alpha Vantage: {symbol} {title} (Annual)]"]
+            lines.extend(report_template.format_map(_ReportFields(r)) for r in reports[:limit or 3])
             return "\n".join(lines)
 
         # EARNINGS
         elif function == "EARNINGS":
             annual_reports = data.get("annualEarnings", [])
             quarterly_reports = data.get("quarterlyEarnings", [])
-            lines = [f"[Alpha Vantage: {symbol.upper()} Annual EPS]"]
+            lines = [f"[Alpha Vantage: {symbol} Annual EPS]"]
             for r in annual_reports[:limit or 5]:
                 lines.append(f"  {r.get('fiscalDateEnding', 'N/A')}: EPS={r.get('reportedEPS', 'N/A')}")
             if quarterly_reports:
@@ -289,8 +525,8 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
             return "\n".join(lines)
 
         # fallback: raw JSON (truncated)
-        raw = json.dumps(data, indent=2)
-        return f"[Alpha Vantage: {symbol.upper()} / {function}]\n{raw[:2000]}"
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        return f"[Alpha Vantage: {symbol} / {function}]\n{raw[:2000]}"
 
     except requests.exceptions.Timeout:
         return f"Request to Alpha Vantage timed out for '{symbol}'."
@@ -299,8 +535,50 @@ def get_stock_data(symbol: str, function: str = "OVERVIEW", limit: int | None =
     except Exception as e:
         return f"Unexpected error fetching stock data for '{symbol}': {str(e)}"
 
-TOOLS = [get_graph_data, get_company_context, get_stock_data]
+
+# Shared by every batch so at most AV_BATCH_MAX_CONCURRENCY Alpha Vantage
+# requests are in flight at once, whatever the number of concurrent users
+AV_BATCH_MAX_CONCURRENCY = 5
+_av_batch_pool = ThreadPoolExecutor(
+    max_workers=AV_BATCH_MAX_CONCURRENCY, thread_name_prefix="alphavantage"
+)
+_SYMBOL_SPLIT = re.compile(r"[\s,]+")
+
+# Between per-symbol blocks of a batch result; the researcher splits on it to
+# judge each symbol on its own
+BATCH_SEPARATOR = "\n\n---\n\n"
+
+
+@tool
+def get_stock_data_batch(
+    symbols: list[str], function: str = "OVERVIEW", limit: int | None = None
+) -> str:
+    """
+    Retrieves the same Alpha Vantage data for several tickers at once.
+    Call this instead of repeated get_stock_data calls when comparing companies.
+    Args:
+        symbols: The stock ticker symbols (e.g. ['AAPL', 'MSFT', 'GOOG']).
+        function: The type of data to retrieve, as for get_stock_data.
+        limit: Optional. Limits the number of items returned per symbol.
+    """
+    if isinstance(symbols, str):
+        symbols = _SYMBOL_SPLIT.split(symbols)
+    unique = list(dict.fromkeys(s.upper().strip() for s in symbols if s and s.strip()))
+    if not unique:
+        return "No symbols given for batch stock lookup."
+    results = _av_batch_pool.map(lambda s: get_stock_data.func(s, function, limit), unique)
+    return BATCH_SEPARATOR.join(results)
+
+
+TOOLS = [get_graph_data, get_company_context, get_stock_data, get_stock_data_batch]
 
 TOOL_MAP = {t.name: t for t in TOOLS}
 
-TOOL_LIST = {t.name: t.description for t in TOOLS}
\ No newline at end of file
+# Plain functions behind the @tool wrappers, and the argument names each one
+# accepts. The researcher calls these directly, skipping StructuredTool's
+# per-call pydantic validation and callback dispatch.
+TOOL_FUNCS  = {t.name: t.func for t in TOOLS}
+TOOL_PARAMS = {t.name: frozenset(t.args) for t in TOOLS}
+
+# Read-only name → description view, built once at import
+TOOL_LIST = MappingProxyType({t.name: t.description for t in TOOLS})
\ No newline at end of file